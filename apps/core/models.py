@@ -1,46 +1,151 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+
 from django.core.exceptions import ValidationError
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
 from django_extensions.db.models import TimeStampedModel
 
+# Disabled in bulk code paths, see `untracked_changes`
+tracking_changes = ContextVar("tracking_changes", default=True)
+
+
+@contextmanager
+def untracked_changes():
+    """Disable snapshots of loaded objects and save all their fields.
+
+    Use it for code, which loads or saves many objects, to not keep copy of
+    data of each of them.
+
+    """
+    token = tracking_changes.set(False)
+    try:
+        yield
+    finally:
+        tracking_changes.reset(token)
+
 
 class BaseModel(TimeStampedModel):
     """Base model for apps' models.
 
-    This class adds to models created and modified fields
+    This class adds to models created and modified fields. Values of
+    concrete fields are remembered when object is loaded or saved, so update
+    saves only changed fields without fetching of row.
 
     """
 
+    # Filled by `prepare_clean_methods`
+    _clean_methods = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Overriden for remember values of loaded fields."""
+        instance = super().from_db(db, field_names, values)
+        if tracking_changes.get():
+            instance.take_snapshot()
+        return instance
+
+    def take_snapshot(self, update_fields=None):
+        """Remember current values of loaded concrete fields.
+
+        If ``update_fields`` is passed, only values of these fields are
+        updated in existing snapshot.
+
+        """
+        snapshot = getattr(self, "_snapshot", None)
+        if update_fields is None or snapshot is None:
+            fields = self._meta.concrete_fields
+            snapshot = self._snapshot = {}
+        else:
+            fields = [self._meta.get_field(name) for name in update_fields]
+        for field in fields:
+            if field.attname in self.__dict__:
+                snapshot[field.attname] = deepcopy(self.__dict__[field.attname])
+
+    def refresh_from_db(self, using=None, fields=None):
+        """Overriden for remember reloaded values of fields."""
+        super().refresh_from_db(using=using, fields=fields)
+        if tracking_changes.get():
+            self.take_snapshot(fields)
+
+    def get_previous_value(self, attname: str):
+        """Get value of field from snapshot or ``None`` if it's unknown."""
+        return getattr(self, "_snapshot", {}).get(attname)
+
+    def get_changed_fields(self) -> list[str] | None:
+        """Get names of fields changed after snapshot.
+
+        Return ``None`` if object has no snapshot. Field, which was deferred
+        on load and set later, is considered as changed.
+
+        """
+        snapshot = getattr(self, "_snapshot", None)
+        if snapshot is None:
+            return None
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (
+                field.attname not in snapshot
+                or snapshot[field.attname] != self.__dict__[field.attname]
+            )
+        ]
+
     def clean(self):
         """Validate model data.
 
         First we collect all errors as dict and then if there any errors, we
         pass them ValidationError and raise it. By doing this django admin and
-        drf can specify for each field an error.
+        drf can specify for each field an error. Only existing ``clean_*``
+        methods are called, see `prepare_clean_methods`.
 
         """
         super().clean()
         errors = {}
-        for field in self._meta.fields:
-            clean_method = f"clean_{field.name}"
-            if hasattr(self, clean_method):
-                try:
-                    getattr(self, clean_method)()
-                except ValidationError as error:
-                    errors[field.name] = error
+        for field_name, clean_method in self._clean_methods:
+            try:
+                clean_method(self)
+            except ValidationError as error:
+                errors[field_name] = error
         if errors:
             raise ValidationError(errors)
 
     def save(self, **kwargs):
         """Overriden for get update fields when object update."""
-        if self.pk:
-            cls = self.__class__
-            old = cls.objects.get(pk=self.pk)
-            changed_fields = []
-            for field in cls._meta.get_fields():
-                if hasattr(old, field.name) and hasattr(self, field.name):
-                    if getattr(old, field.name) != getattr(self, field.name):
-                        changed_fields.append(field.name)
-            kwargs["update_fields"] = changed_fields
+        tracking = tracking_changes.get()
+        if tracking and not self._state.adding and "update_fields" not in kwargs:
+            changed_fields = self.get_changed_fields()
+            if changed_fields is not None:
+                update_modified = kwargs.get(
+                    "update_modified",
+                    getattr(self, "update_modified", True),
+                )
+                if changed_fields and update_modified:
+                    changed_fields = list({*changed_fields, "modified"})
+                kwargs["update_fields"] = changed_fields
         super().save(**kwargs)
+        if tracking:
+            self.take_snapshot(kwargs.get("update_fields"))
 
     class Meta:
         abstract = True
+
+
+def get_clean_methods(model) -> tuple:
+    """Get pairs of field name and ``clean_<field>`` method of model."""
+    clean_methods = []
+    for field in model._meta.fields:
+        clean_method = getattr(model, f"clean_{field.name}", None)
+        if clean_method is not None:
+            clean_methods.append((field.name, clean_method))
+    return tuple(clean_methods)
+
+
+# Connected here, because models of apps are prepared before their signals
+@receiver(class_prepared)
+def prepare_clean_methods(sender, **kwargs):
+    """Build dispatch table of ``clean_<field>`` methods for new model."""
+    if issubclass(sender, BaseModel):
+        sender._clean_methods = get_clean_methods(sender)
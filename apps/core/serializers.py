@@ -9,3 +9,44 @@ class BaseSerializer(serializers.ModelSerializer):
         super().__init__(*args, **kwargs)
         self._request = self.context.get("request")
         self._user = getattr(self._request, "user", None)
+
+
+class LimitedPrimaryKeysField(serializers.ReadOnlyField):
+    """Field for render only first pks of reverse relation."""
+
+    def __init__(self, limit: int, **kwargs):
+        """Set max count of rendered pks."""
+        self.limit = limit
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        """Get first pks of related manager by one query."""
+        return list(value.order_by("pk").values_list("pk", flat=True)[: self.limit])
+
+
+class ExpandableFieldsMixin:
+    """Mixin for render expensive fields only if they are requested.
+
+    Fields from ``Meta.expandable_fields`` are rendered only if their names
+    are passed in ``expand`` query param, e.g. ``?expand=answers,comments``.
+
+    """
+
+    expand_query_param = "expand"
+
+    def get_expanded_fields(self) -> set[str]:
+        """Get names of fields requested by query param."""
+        request = self.context.get("request")
+        if request is None:
+            return set()
+        value = request.query_params.get(self.expand_query_param, "")
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    def get_fields(self):
+        """Overriden for drop expandable fields, which aren't requested."""
+        fields = super().get_fields()
+        expanded = self.get_expanded_fields()
+        for name in getattr(self.Meta, "expandable_fields", ()):
+            if name not in expanded:
+                fields.pop(name, None)
+        return fields
@@ -1,2 +1,5 @@
-from .email import send_email
-from .pagination import PaginationObject
+from .counting import CountResult, count_queryset
+from .email import send_email, send_emails
+from .pagination import CursorPaginationObject, PaginationObject
+from .scheduling import apply_once, release
+from .versions import bump_list_version, get_list_version
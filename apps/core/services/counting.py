@@ -0,0 +1,78 @@
+import hashlib
+import json
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+# Tables with more estimated rows are counted approximately on PostgreSQL
+EXACT_COUNT_THRESHOLD = 10000
+COUNT_CACHE_TIMEOUT = 30
+
+
+class CountResult(NamedTuple):
+    """Count of objects and flag that it's estimated."""
+
+    value: int
+    is_approximate: bool
+
+
+def get_count_cache_key(queryset) -> str:
+    """Get key of count by normalized SQL of filters of queryset."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.md5(f"{sql}|{params}".encode()).hexdigest()
+    return f"count:{queryset.db}:{digest}"
+
+
+def estimate_table_rows(queryset) -> int | None:
+    """Get count of rows of table from statistics of PostgreSQL."""
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # Table without statistics has -1 or 0 tuples
+    return row[0] if row and row[0] > 0 else None
+
+
+def estimate_query_rows(queryset) -> int:
+    """Get count of rows of query from plan of PostgreSQL."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_queryset(queryset) -> CountResult:
+    """Count objects of queryset.
+
+    Small tables are counted exactly. For big tables of PostgreSQL count of
+    rows without filters is taken from statistics of table and count of
+    filtered rows is taken from plan of query. Result is cached for short
+    time by SQL of queryset.
+
+    """
+    try:
+        key = get_count_cache_key(queryset)
+    except EmptyResultSet:
+        return CountResult(0, False)
+    result = cache.get(key)
+    if result is not None:
+        return CountResult(*result)
+    result = None
+    if connections[queryset.db].vendor == "postgresql":
+        table_rows = estimate_table_rows(queryset)
+        if table_rows is not None and table_rows > EXACT_COUNT_THRESHOLD:
+            value = (
+                estimate_query_rows(queryset) if queryset.query.where else table_rows
+            )
+            result = CountResult(value, True)
+    if result is None:
+        result = CountResult(queryset.count(), False)
+    cache.set(key, tuple(result), COUNT_CACHE_TIMEOUT)
+    return result
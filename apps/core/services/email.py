@@ -1,5 +1,6 @@
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import get_template
 
 TEMPLATES = {
@@ -7,31 +8,78 @@ TEMPLATES = {
     "attendance": "courses/course_attendance.html",
     "entered": "courses/entered_to_course.html",
 }
+COURSE_FRAGMENT_TIMEOUT = 60 * 60
 
 
-def send_email(
-    action,
-    user,
-    course=None,
-):
-    """Function for send email with html template."""
-    context = {
+def get_course_fragment(course) -> dict:
+    """Get rendered parts of email about course.
+
+    Parts are cached by ``modified`` of course, so changes of course and its
+    topics, which touch course, invalidate them.
+
+    """
+    key = f"email:course:{course.pk}:{course.modified.timestamp()}"
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = {
+            "course": course.name,
+            "topics": (
+                "<ul>"
+                + "".join([f"<li>{topic.title}</li>" for topic in course.topics.all()])
+                + "</ul>"
+            ),
+        }
+        cache.set(key, fragment, COURSE_FRAGMENT_TIMEOUT)
+    return fragment
+
+
+def get_course_context(course) -> dict:
+    """Get context of email template, which is common for all recipients."""
+    return {
         "app_label": settings.APP_LABEL,
+        **get_course_fragment(course),
+        "count_students": course.students_count,
     }
-    html = get_template(TEMPLATES[action])
 
-    context["course"] = course.name
-    context["topics"] = (
-        "<ul>"
-        + "".join([f"<li>{topic.title}</li>" for topic in course.topics.all()])
-        + "</ul>"
-    )
-    context["count_students"] = course.students.count()
-    html_content = html.render(context)
+
+def render_email(action, course) -> str:
+    """Render html template of email."""
+    return get_template(TEMPLATES[action]).render(get_course_context(course))
+
+
+def build_email(user, html_content) -> EmailMultiAlternatives:
+    """Build email with html content for user."""
     msg = EmailMultiAlternatives(
         subject=user.username,
         from_email=settings.EMAIL_HOST_USER,
         to=[user.email],
     )
     msg.attach_alternative(html_content, "text/html")
-    msg.send()
+    return msg
+
+
+def send_email(
+    action,
+    user,
+    course=None,
+):
+    """Function for send email with html template."""
+    build_email(user, render_email(action, course)).send()
+
+
+def send_emails(
+    action,
+    users,
+    course=None,
+) -> int:
+    """Send emails with html template to many users.
+
+    Template is rendered once for all users and messages are sent by one
+    connection of email backend. Return count of sent messages.
+
+    """
+    html_content = render_email(action, course)
+    messages = [build_email(user, html_content) for user in users]
+    if not messages:
+        return 0
+    return get_connection().send_messages(messages)
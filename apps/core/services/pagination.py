@@ -1,9 +1,64 @@
-from rest_framework import pagination, response
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, pagination, response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counting import CountResult, count_queryset
+
+
+def count_objects(object_list) -> CountResult:
+    """Count objects of queryset by strategy of `count_queryset`."""
+    if isinstance(object_list, QuerySet):
+        return count_queryset(object_list)
+    return CountResult(len(object_list), False)
+
+
+class CountingPaginator(Paginator):
+    """Paginator, which counts objects by `count_objects`."""
+
+    @cached_property
+    def count_result(self) -> CountResult:
+        return count_objects(self.object_list)
+
+    @cached_property
+    def count(self) -> int:
+        return self.count_result.value
+
+    def validate_number(self, number) -> int:
+        """Overriden for check only lower bound, count may be stale."""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        """Overriden for don't cut page by count, which may be stale."""
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        object_list = self.object_list[bottom:top]
+        if number > 1 and not object_list:
+            raise EmptyPage(_("That page contains no results"))
+        return self._get_page(object_list, number, self)
 
 
 class PaginationObject(pagination.PageNumberPagination):
     """Class for paginate object."""
 
+    django_paginator_class = CountingPaginator
+
     def get_paginated_response(self, data):
         """Overriden for get links on previous and next pages."""
         return response.Response(
@@ -13,7 +68,110 @@ class PaginationObject(pagination.PageNumberPagination):
                     "previous": self.get_previous_link(),
                 },
                 "count": self.page.paginator.count,
+                "count_is_approximate": self.page.paginator.count_result.is_approximate,
                 "total_pages": self.page.paginator.num_pages,
                 "results": data,
             }
         )
+
+
+class CursorPaginationObject(pagination.BasePagination):
+    """Class for paginate object by cursor.
+
+    Page is selected by keyset condition on (created, id) instead of
+    ``OFFSET``, so deep pages cost the same as first one. Count of objects
+    is calculated only if ``count`` query param is passed or
+    ``count_by_default`` is set.
+
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    count_by_default = False
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Get page of objects after or before position from cursor."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.count = (
+            count_objects(queryset) if self.is_count_requested(request) else None
+        )
+        position = self.decode_cursor(request)
+        reverse = position is not None and position[2]
+        if position is not None:
+            created, pk, _ = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created__gt=created) | Q(created=created, id__gt=pk),
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created__lt=created) | Q(created=created, id__lt=pk),
+                )
+        ordering = ("created", "id") if reverse else ("-created", "-id")
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = results
+        return results
+
+    def is_count_requested(self, request) -> bool:
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.count_by_default
+        return value.lower() in ("1", "true", "yes")
+
+    def get_paginated_response(self, data):
+        """Get response with the same envelope as `PaginationObject`."""
+        content = {
+            "links": {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            },
+        }
+        if self.count is not None:
+            content["count"] = self.count.value
+            content["count_is_approximate"] = self.count.is_approximate
+        content["results"] = data
+        return response.Response(content)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        """Get url with cursor on position of instance."""
+        position = f"{int(reverse)}|{instance.created.isoformat()}|{instance.pk}"
+        cursor = b64encode(position.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Get (created, id, reverse) from cursor of request."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            reverse, created, pk = b64decode(cursor.encode()).decode().split("|")
+            created = parse_datetime(created)
+            if created is None:
+                raise ValueError
+            return created, int(pk), bool(int(reverse))
+        except (BinasciiError, UnicodeDecodeError, ValueError):
+            raise exceptions.NotFound(self.invalid_cursor_message)
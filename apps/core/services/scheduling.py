@@ -0,0 +1,20 @@
+from django.core.cache import cache
+
+
+def apply_once(task, args, key: str, countdown: int) -> bool:
+    """Apply task with countdown unless it's already scheduled by key.
+
+    Calls during countdown are coalesced into one run of task. Task should
+    call `release` before its work, so changes made during its run schedule
+    next run.
+
+    """
+    if not cache.add(key, True, countdown):
+        return False
+    task.apply_async(args, countdown=countdown)
+    return True
+
+
+def release(key: str) -> None:
+    """Allow next scheduling of task by key."""
+    cache.delete(key)
@@ -0,0 +1,27 @@
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_list_version_key(model) -> str:
+    """Get cache key of version of lists of model."""
+    return f"list-version:{model._meta.label_lower}"
+
+
+def get_list_version(model) -> int:
+    """Get version of lists of model, ``0`` if it wasn't changed yet."""
+    return cache.get(get_list_version_key(model), 0)
+
+
+def bump_list_version(model) -> None:
+    """Change version of lists of model after commit.
+
+    Version is changed by any change of objects, which may add, remove or
+    reorder them in filtered lists, including bulk updates.
+
+    """
+    transaction.on_commit(
+        partial(cache.set, get_list_version_key(model), time.time_ns(), None),
+    )
@@ -1,15 +1,172 @@
-from rest_framework import mixins, viewsets
+import hashlib
 
-from apps.core.services.pagination import PaginationObject
+from django.conf import settings
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, response, viewsets
 
+from apps.core.services.pagination import CursorPaginationObject, PaginationObject
+from apps.core.services.versions import get_list_version
 
-class BaseViewSet(viewsets.ModelViewSet):
+
+class PaginationModeMixin:
+    """Mixin for choose pagination by ``pagination`` query param.
+
+    ``?pagination=cursor`` switches view to `CursorPaginationObject`,
+    default mode is set by ``PAGINATION_MODE`` setting.
+
+    """
+
+    pagination_mode_query_param = "pagination"
+    cursor_pagination_class = CursorPaginationObject
+
+    @property
+    def paginator(self):
+        """Overriden for use cursor pagination if it's requested."""
+        if not hasattr(self, "_paginator") and self.pagination_class is not None:
+            mode = self.request.query_params.get(
+                self.pagination_mode_query_param,
+                settings.PAGINATION_MODE,
+            )
+            if mode == "cursor":
+                self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """Set ``ETag`` and ``Last-Modified`` headers of response."""
+    if etag is not None:
+        response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def is_conditional(request) -> bool:
+    """Check that request has validators of cached representation."""
+    return any(
+        header in request.headers for header in ("If-None-Match", "If-Modified-Since")
+    )
+
+
+class ConditionalRetrieveMixin:
+    """Mixin for answer ``304`` to conditional GET of object.
+
+    Validators are computed from ``modified`` of object, which is fetched by
+    one query before the object itself, and from query params changing
+    representation of object.
+
+    """
+
+    # Query params, which change representation of object or list
+    representation_query_params = ("expand", "fields")
+
+    def get_representation_key(self) -> str:
+        """Get values of query params, which change representation."""
+        params = self.request.query_params
+        return "&".join(
+            f"{name}={','.join(params.getlist(name))}"
+            for name in self.representation_query_params
+            if name in params
+        )
+
+    def get_modified_queryset(self):
+        """Get queryset for look up ``modified`` of object from url."""
+        return self.filter_queryset(self.get_queryset())
+
+    def get_object_modified(self):
+        """Get ``modified`` of object from url or ``None`` if it's not found."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return (
+            self.get_modified_queryset()
+            .prefetch_related(None)
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list("modified", flat=True)
+            .first()
+        )
+
+    def get_object_validators(self, modified) -> dict:
+        """Get ETag and Last-Modified of object."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        label = self.get_queryset().model._meta.label_lower
+        etag = f"{label}-{self.kwargs[lookup_url_kwarg]}-{modified.timestamp()}"
+        representation = self.get_representation_key()
+        if representation:
+            etag += f"-{hashlib.md5(representation.encode()).hexdigest()}"
+        return {
+            "etag": quote_etag(etag),
+            "last_modified": int(modified.timestamp()),
+        }
+
+    def retrieve(self, request, *args, **kwargs):
+        """Overriden for answer ``304`` if object isn't modified.
+
+        ``modified`` is fetched separately only for conditional request,
+        other requests take it from object.
+
+        """
+        instance = None
+        if is_conditional(request):
+            modified = self.get_object_modified()
+            if modified is None:
+                raise Http404
+        else:
+            instance = self.get_object()
+            modified = instance.modified
+        validators = self.get_object_validators(modified)
+        not_modified = get_conditional_response(request, **validators)
+        if not_modified is not None:
+            return not_modified
+        if instance is None:
+            instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return set_validators(response.Response(serializer.data), **validators)
+
+
+class ConditionalListMixin:
+    """Mixin for answer ``304`` to conditional GET of list.
+
+    ETag is computed from query params of request and version of lists of
+    model, which changes when object is saved, updated or deleted, so
+    validators of list need no queries. List has no Last-Modified, because
+    version isn't a moment of change.
+
+    """
+
+    def get_list_validators(self) -> dict:
+        """Get ETag of list by version of lists of model."""
+        key = "|".join(
+            (
+                self.request.get_full_path(),
+                str(get_list_version(self.get_queryset().model)),
+            ),
+        )
+        return {"etag": quote_etag(hashlib.md5(key.encode()).hexdigest())}
+
+    def list(self, request, *args, **kwargs):
+        """Overriden for answer ``304`` if list isn't modified."""
+        validators = self.get_list_validators()
+        not_modified = get_conditional_response(request, **validators)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(super().list(request, *args, **kwargs), **validators)
+
+
+class BaseViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    PaginationModeMixin,
+    viewsets.ModelViewSet,
+):
     """Base ViewSet for other views."""
 
     pagination_class = PaginationObject
 
 
 class SimpleBaseViewSet(
+    ConditionalRetrieveMixin,
+    PaginationModeMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
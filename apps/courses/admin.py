@@ -135,3 +135,22 @@ class AnswerByUserAdmin(admin.ModelAdmin):
         "created",
         "modified",
     )
+
+
+@admin.register(models.CourseNotification)
+class CourseNotificationAdmin(admin.ModelAdmin):
+    """Class representation of CourseNotification model in admin panel."""
+
+    autocomplete_fields = (
+        "user",
+        "course",
+    )
+    list_filter = ("mode",)
+    list_display = (
+        "id",
+        "course",
+        "user",
+        "mode",
+        "sent",
+        "created",
+    )
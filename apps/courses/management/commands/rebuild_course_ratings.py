@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.courses import models, services
+
+
+class Command(BaseCommand):
+    """Command for recalculate stored ratings of courses."""
+
+    help = "Rebuild stored sum and count of ratings of courses from reviews"
+
+    def handle(self, *args, **options):
+        count = services.update_course_ratings(models.Course.objects.all())
+        self.stdout.write(f"Ratings of {count} courses are rebuilt")
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_course_ratings(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Review = apps.get_model("courses", "Review")
+    reviews = Review.objects.filter(course=OuterRef("pk")).order_by().values("course")
+    Course.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum("rating")).values("total")),
+            0,
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count("id")).values("total")),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="rating_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Count of reviews"
+            ),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_sum",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Sum of ratings of reviews"
+            ),
+        ),
+        migrations.RunPython(fill_course_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:06
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+CREATE_INDEX = """
+    CREATE INDEX courses_course_search_vector_gin
+    ON courses_course USING gin (search_vector)
+"""
+DROP_INDEX = "DROP INDEX IF EXISTS courses_course_search_vector_gin"
+FILL_VECTORS = """
+    UPDATE courses_course SET search_vector =
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+"""
+
+
+def create_search_index(apps, schema_editor):
+    """Create GIN index and fill vectors, other databases use fallback."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(FILL_VECTORS)
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0002_course_rating"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                null=True,
+                verbose_name="Search vector of name and description",
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
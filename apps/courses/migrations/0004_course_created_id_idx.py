@@ -0,0 +1,17 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0003_course_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["created", "id"], name="course_created_id_idx"),
+        ),
+    ]
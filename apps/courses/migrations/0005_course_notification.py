@@ -0,0 +1,90 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("courses", "0004_course_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "mode",
+                    models.CharField(
+                        choices=[
+                            ("create", "Create"),
+                            ("attendance", "Attendance"),
+                            ("entered", "Entered"),
+                        ],
+                        max_length=32,
+                        verbose_name="Mode of notification",
+                    ),
+                ),
+                (
+                    "sent",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Sending time"
+                    ),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="courses.course",
+                        verbose_name="Course of notification",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Recipient of notification",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Course notification",
+                "verbose_name_plural": "Course notifications",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="coursenotification",
+            index=models.Index(
+                condition=models.Q(("sent__isnull", True)),
+                fields=["course", "mode"],
+                name="course_notification_pending",
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:18
+
+from django.db import migrations, models
+from django.db.models import Case, Count, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+# Milestones, which were reached before, aren't notified again
+STUDENTS_COUNT = (1000, 100)
+
+
+def fill_students_count(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    students = (
+        Course.students.through.objects.filter(course=OuterRef("pk"))
+        .order_by()
+        .values("course")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Course.objects.update(students_count=Coalesce(Subquery(students), 0))
+    Course.objects.update(
+        students_milestone=Case(
+            *[
+                When(students_count__gte=value, then=Value(value))
+                for value in STUDENTS_COUNT
+            ],
+            default=Value(0),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0005_course_notification"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="students_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Count of students"
+            ),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="students_milestone",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                verbose_name="Last notified milestone of count of students",
+            ),
+        ),
+        migrations.RunPython(fill_students_count, migrations.RunPython.noop),
+    ]
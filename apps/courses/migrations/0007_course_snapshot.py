@@ -0,0 +1,61 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0006_course_students_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseSnapshot",
+            fields=[
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "course",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="snapshot",
+                        serialize=False,
+                        to="courses.course",
+                        verbose_name="Course of snapshot",
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveIntegerField(
+                        default=1, verbose_name="Version of snapshot"
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        blank=True,
+                        null=True,
+                        verbose_name="Serialized outline of course",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Course snapshot",
+                "verbose_name_plural": "Course snapshots",
+            },
+        ),
+    ]
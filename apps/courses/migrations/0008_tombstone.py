@@ -0,0 +1,66 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:25
+
+from django.db import migrations, models
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0007_course_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                (
+                    "course_id",
+                    models.PositiveBigIntegerField(
+                        verbose_name="Course of deleted object"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        max_length=32, verbose_name="Kind of deleted object"
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.PositiveBigIntegerField(verbose_name="Id of deleted object"),
+                ),
+            ],
+            options={
+                "verbose_name": "Tombstone",
+                "verbose_name_plural": "Tombstones",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["course_id", "created"], name="tombstone_course_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:27
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_comment_paths(apps, schema_editor):
+    Comment = apps.get_model("courses", "Comment")
+    parents = dict(Comment.objects.values_list("id", "parent_id"))
+    paths = {}
+
+    def get_path(pk):
+        if pk not in paths:
+            parent_id = parents[pk]
+            parent_path, depth = get_path(parent_id) if parent_id else ("", -1)
+            paths[pk] = (f"{parent_path}{pk:010d}/", depth + 1)
+        return paths[pk]
+
+    comments = []
+    for pk in parents:
+        path, depth = get_path(pk)
+        comments.append(Comment(id=pk, path=path, depth=depth))
+    Comment.objects.bulk_update(comments, ("path", "depth"), batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0008_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, verbose_name="Depth of comment in thread"
+            ),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(
+                default="",
+                editable=False,
+                max_length=1024,
+                verbose_name="Materialized path of comment in thread",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["task", "path"], name="comment_task_path_idx"),
+        ),
+        migrations.RunPython(fill_comment_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0009_comment_path"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["task", "created", "id"], name="comment_task_created_idx"
+            ),
+        ),
+    ]
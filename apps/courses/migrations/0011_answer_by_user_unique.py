@@ -0,0 +1,32 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:33
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def delete_duplicate_answers(apps, schema_editor):
+    AnswerByUser = apps.get_model("courses", "AnswerByUser")
+    # Answer of user to task with the biggest id is kept
+    last = (
+        AnswerByUser.objects.values("user", "task")
+        .annotate(last_id=Max("id"))
+        .values("last_id")
+    )
+    AnswerByUser.objects.exclude(id__in=last).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0010_comment_task_created_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_answers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="answerbyuser",
+            constraint=models.UniqueConstraint(
+                fields=("user", "task"), name="answer_by_user_user_task_uniq"
+            ),
+        ),
+    ]
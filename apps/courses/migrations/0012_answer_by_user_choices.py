@@ -0,0 +1,20 @@
+# Generated by Django 3.2.13 on 2026-10-17 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0011_answer_by_user_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answerbyuser",
+            name="choices",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Pks of answers chosen by user"
+            ),
+        ),
+    ]
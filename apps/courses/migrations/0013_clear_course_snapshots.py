@@ -0,0 +1,21 @@
+# Generated by Django 3.2.13 on 2026-10-18 00:30
+
+from django.db import migrations
+from django.db.models import F
+
+
+def clear_course_snapshots(apps, schema_editor):
+    # Snapshots with correct answers are rebuilt without them
+    CourseSnapshot = apps.get_model("courses", "CourseSnapshot")
+    CourseSnapshot.objects.update(version=F("version") + 1, data=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0012_answer_by_user_choices"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_course_snapshots, migrations.RunPython.noop),
+    ]
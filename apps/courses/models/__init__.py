@@ -1,2 +1,5 @@
 from .courses import Answer, AnswerByUser, Category, Comment, Course, Task, Topic
+from .notifications import CourseNotification
 from .reviews import Review
+from .snapshots import CourseSnapshot
+from .tombstones import Tombstone
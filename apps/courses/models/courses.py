@@ -1,10 +1,21 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.utils.translation import gettext_lazy as _
 
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, tracking_changes
+
+from .deletion import CascadeDeletionMixin
+
+# Width of pk in materialized path of comment with separator
+PATH_STEP = 11
+PATH_MAX_LENGTH = 1024
+# Depth of the deepest reply, which path fits into column
+MAX_COMMENT_DEPTH = PATH_MAX_LENGTH // PATH_STEP - 1
 
 
 def get_directory_path(instance, filename) -> str:
@@ -17,7 +28,7 @@ def get_sentinel_user():
     return get_user_model().objects.get_or_create(username="Deleted")[0]
 
 
-class Course(BaseModel):
+class Course(CascadeDeletionMixin, BaseModel):
     """Model for Course.
 
     Statuses of course:
@@ -89,14 +100,67 @@ class Course(BaseModel):
         verbose_name=_("Owner of course"),
         related_name="courses",
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name=_("Sum of ratings of reviews"),
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name=_("Count of reviews"),
+        default=0,
+        editable=False,
+    )
+    students_count = models.PositiveIntegerField(
+        verbose_name=_("Count of students"),
+        default=0,
+        editable=False,
+    )
+    students_milestone = models.PositiveIntegerField(
+        verbose_name=_("Last notified milestone of count of students"),
+        default=0,
+        editable=False,
+    )
+    search_vector = SearchVectorField(
+        verbose_name=_("Search vector of name and description"),
+        null=True,
+        editable=False,
+    )
 
     def __str__(self) -> str:
         """String representation of object."""
         return f"Course {self.name}"
 
+    @property
+    def rating(self) -> float:
+        """Get average rating of course from stored aggregate of reviews."""
+        return self.rating_sum / self.rating_count if self.rating_count else 0
+
+    def is_member(self, relation: str, user) -> bool:
+        """Check that user is in many-to-many ``relation`` of course.
+
+        Query checks existence of row in through table by its unique index on
+        (course_id, user_id) instead of loading all users of relation.
+
+        """
+        if not user.is_authenticated:
+            return False
+        through = getattr(Course, relation).through
+        return through.objects.filter(course_id=self.pk, user_id=user.pk).exists()
+
+    def has_student(self, user) -> bool:
+        """Check that user is student of course."""
+        return self.is_member("students", user)
+
     class Meta:
         verbose_name_plural = _("Courses")
         verbose_name = _("Course")
+        indexes = (
+            # Keyset of cursor pagination
+            models.Index(
+                fields=("created", "id"),
+                name="course_created_id_idx",
+            ),
+        )
 
 
 class Category(BaseModel):
@@ -116,7 +180,7 @@ class Category(BaseModel):
         verbose_name = _("Category")
 
 
-class Topic(BaseModel):
+class Topic(CascadeDeletionMixin, BaseModel):
     """Model for Topic."""
 
     title = models.CharField(
@@ -142,7 +206,7 @@ class Topic(BaseModel):
         verbose_name = _("Topic")
 
 
-class Task(BaseModel):
+class Task(CascadeDeletionMixin, BaseModel):
     """Model for Task.
 
     Task types:
@@ -213,7 +277,7 @@ class Answer(BaseModel):
         verbose_name = _("Answer")
 
 
-class Comment(BaseModel):
+class Comment(CascadeDeletionMixin, BaseModel):
     """Model for Comment."""
 
     content = models.TextField(
@@ -239,14 +303,87 @@ class Comment(BaseModel):
         on_delete=models.SET(get_sentinel_user),
         verbose_name=_("Owner of comment"),
     )
+    path = models.CharField(
+        max_length=PATH_MAX_LENGTH,
+        verbose_name=_("Materialized path of comment in thread"),
+        default="",
+        editable=False,
+    )
+    depth = models.PositiveSmallIntegerField(
+        verbose_name=_("Depth of comment in thread"),
+        default=0,
+        editable=False,
+    )
 
     def __str__(self) -> str:
         """String representation of object."""
         return f"Comment {self.content}"
 
+    def get_parent_path(self) -> tuple[str, int]:
+        """Get path of parent and depth of comment."""
+        if self.parent_id is None:
+            return "", 0
+        path, depth = Comment.objects.values_list("path", "depth").get(
+            pk=self.parent_id,
+        )
+        return path, depth + 1
+
+    def save(self, **kwargs):
+        """Overriden for maintain materialized path of comment.
+
+        Path is pks of ancestors and of comment itself, padded to the same
+        width, so ordering by path gives threads in depth-first order. Path
+        is written after insert, when pk is known. If parent is changed,
+        paths of the whole subtree are rewritten by one ``UPDATE``. If
+        previous parent is unknown, path is recomputed and compared.
+
+        """
+        with transaction.atomic():
+            adding = self._state.adding
+            old_path, old_depth = self.path, self.depth
+            snapshot = getattr(self, "_snapshot", {})
+            known = "parent_id" in snapshot
+            moved = known and snapshot["parent_id"] != self.parent_id
+            super().save(**kwargs)
+            if not adding and known and not moved:
+                return
+            parent_path, self.depth = self.get_parent_path()
+            self.path = f"{parent_path}{self.pk:0{PATH_STEP - 1}d}/"
+            if self.path == old_path:
+                return
+            if adding or not old_path:
+                Comment.objects.filter(pk=self.pk).update(
+                    path=self.path,
+                    depth=self.depth,
+                )
+            else:
+                if self.path.startswith(old_path):
+                    raise ValueError("Comment can't be moved into its subtree")
+                Comment.objects.filter(path__startswith=old_path).update(
+                    path=Concat(
+                        Value(self.path),
+                        Substr("path", len(old_path) + 1),
+                    ),
+                    depth=F("depth") + self.depth - old_depth,
+                )
+            if tracking_changes.get():
+                self.take_snapshot(["path", "depth"])
+
     class Meta:
         verbose_name_plural = _("Comments")
         verbose_name = _("Comment")
+        indexes = (
+            # Threads of task in depth-first order
+            models.Index(
+                fields=("task", "path"),
+                name="comment_task_path_idx",
+            ),
+            # Keyset of cursor pagination of comments of task
+            models.Index(
+                fields=("task", "created", "id"),
+                name="comment_task_created_idx",
+            ),
+        )
 
 
 class AnswerByUser(BaseModel):
@@ -268,7 +405,19 @@ class AnswerByUser(BaseModel):
         null=True,
         default=None,
     )
+    choices = models.JSONField(
+        verbose_name=_("Pks of answers chosen by user"),
+        blank=True,
+        default=list,
+    )
 
     class Meta:
         verbose_name_plural = _("Answers By User")
         verbose_name = _("Answer By User")
+        constraints = (
+            # Target of upsert of answer
+            models.UniqueConstraint(
+                fields=("user", "task"),
+                name="answer_by_user_user_task_uniq",
+            ),
+        )
@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models
+
+# Pairs of model and pk of objects deleted by current cascade, see
+# `cascade_deletion`
+deleted_objects = ContextVar("deleted_objects", default=None)
+
+
+@contextmanager
+def cascade_deletion():
+    """Collect objects deleted in block, including nested deletions.
+
+    Objects are added by ``pre_delete`` signal, which is sent for the whole
+    cascade before any ``post_delete``, so receivers of ``post_delete`` know
+    that parent of object is deleted too.
+
+    """
+    if deleted_objects.get() is not None:
+        yield
+        return
+    token = deleted_objects.set(set())
+    try:
+        yield
+    finally:
+        deleted_objects.reset(token)
+
+
+def is_deleted(model, pk) -> bool:
+    """Check that object is deleted by current cascade."""
+    deleted = deleted_objects.get()
+    return deleted is not None and (model, pk) in deleted
+
+
+class CascadeQuerySet(models.QuerySet):
+    """QuerySet of objects, which deletion cascades to their children."""
+
+    def delete(self):
+        """Overriden for collect objects deleted in cascade."""
+        with cascade_deletion():
+            return super().delete()
+
+
+class CascadeDeletionMixin(models.Model):
+    """Mixin for models, which deletion cascades to their children."""
+
+    objects = CascadeQuerySet.as_manager()
+
+    def delete(self, **kwargs):
+        """Overriden for collect objects deleted in cascade."""
+        with cascade_deletion():
+            return super().delete(**kwargs)
+
+    class Meta:
+        abstract = True
@@ -0,0 +1,59 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.models import BaseModel
+
+
+class CourseNotification(BaseModel):
+    """Model for notification about course in outbox.
+
+    Modes of notification:
+        Create: course got ``ready`` status, recipient is owner
+        Attendance: count of students reached milestone, recipient is owner
+        Entered: user became student of course
+    """
+
+    class Mode(models.TextChoices):
+        """Class choices."""
+
+        CREATE = "create", _("Create")
+        ATTENDANCE = "attendance", _("Attendance")
+        ENTERED = "entered", _("Entered")
+
+    course = models.ForeignKey(
+        "courses.Course",
+        on_delete=models.CASCADE,
+        verbose_name=_("Course of notification"),
+        related_name="notifications",
+    )
+    user = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        verbose_name=_("Recipient of notification"),
+    )
+    mode = models.CharField(
+        max_length=32,
+        verbose_name=_("Mode of notification"),
+        choices=Mode.choices,
+    )
+    sent = models.DateTimeField(
+        verbose_name=_("Sending time"),
+        null=True,
+        blank=True,
+    )
+
+    def __str__(self) -> str:
+        """String representation of object."""
+        return f"Notification {self.mode}, course {self.course_id}"
+
+    class Meta:
+        verbose_name_plural = _("Course notifications")
+        verbose_name = _("Course notification")
+        indexes = (
+            # Pending notifications of dispatch
+            models.Index(
+                fields=("course", "mode"),
+                condition=models.Q(sent__isnull=True),
+                name="course_notification_pending",
+            ),
+        )
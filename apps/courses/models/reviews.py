@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.models import BaseModel
@@ -31,6 +31,11 @@ class Review(BaseModel):
         """String representation of object."""
         return f"Review {self.rating}, review {self.review[:10]}"
 
+    def save(self, **kwargs):
+        """Overriden for update rating of course in the same transaction."""
+        with transaction.atomic():
+            super().save(**kwargs)
+
     class Meta:
         verbose_name_plural = _("Reviews")
         verbose_name = _("Review")
@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.models import BaseModel
+
+
+class CourseSnapshot(BaseModel):
+    """Model for serialized outline of published course.
+
+    Version is increased on each change of course or its topics, tasks and
+    answers, then data is cleared until snapshot is rebuilt.
+    """
+
+    course = models.OneToOneField(
+        "courses.Course",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name=_("Course of snapshot"),
+        related_name="snapshot",
+    )
+    version = models.PositiveIntegerField(
+        verbose_name=_("Version of snapshot"),
+        default=1,
+    )
+    data = models.JSONField(
+        verbose_name=_("Serialized outline of course"),
+        null=True,
+        blank=True,
+    )
+
+    def __str__(self) -> str:
+        """String representation of object."""
+        return f"Snapshot of course {self.course_id}, version {self.version}"
+
+    class Meta:
+        verbose_name_plural = _("Course snapshots")
+        verbose_name = _("Course snapshot")
@@ -0,0 +1,39 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.models import BaseModel
+
+
+class Tombstone(BaseModel):
+    """Model for deleted object of course.
+
+    Course is stored as plain id, so tombstones don't cascade deletion of
+    course and are removed by its signal. Children deleted by cascade have
+    no tombstones, only the deleted root object has.
+    """
+
+    course_id = models.PositiveBigIntegerField(
+        verbose_name=_("Course of deleted object"),
+    )
+    kind = models.CharField(
+        max_length=32,
+        verbose_name=_("Kind of deleted object"),
+    )
+    object_id = models.PositiveBigIntegerField(
+        verbose_name=_("Id of deleted object"),
+    )
+
+    def __str__(self) -> str:
+        """String representation of object."""
+        return f"Tombstone {self.kind} {self.object_id}"
+
+    class Meta:
+        verbose_name_plural = _("Tombstones")
+        verbose_name = _("Tombstone")
+        indexes = (
+            # Changes of course since cursor
+            models.Index(
+                fields=("course_id", "created"),
+                name="tombstone_course_created_idx",
+            ),
+        )
@@ -1,55 +1,99 @@
+from django.utils.functional import cached_property
 from rest_framework import permissions
 
-from . import models, serializers
-
-
-def get_course_instanse(data: dict) -> models.Course:
-    """In dependencies of data get `Course` instanse."""
-    if "course" in data:
-        return models.Course.objects.get(pk=data["course"])
-    if "task" in data:
-        task_json = serializers.TaskSerializer(
-            models.Task.objects.get(pk=data["task"]),
-        ).data
-        return get_course_instanse(task_json)
-    if "topic" in data:
-        topic_json = serializers.TopicSerializer(
-            models.Topic.objects.get(pk=data["topic"]),
-        ).data
-        return get_course_instanse(topic_json)
-    if "answer" in data:
-        answer_json = serializers.AnswerSerializer(
-            models.Answer.objects.get(pk=data["answer"]),
-        ).data
-        return get_course_instanse(answer_json)
-    if "comment" in data:
-        comment_json = serializers.CommentSerializer(
-            models.Comment.objects.get(pk=data["comment"]),
-        ).data
-        return get_course_instanse(comment_json)
-    if "review" in data:
-        review_json = serializers.ReviewSerializer(
-            models.Review.objects.get(pk=data["review"]),
-        ).data
-        return get_course_instanse(review_json)
-    if "answer-by-user" in data:
-        answer_by_user = serializers.AnswerByUserSerializer(
-            models.AnswerByUser.objects.get(pk=data["answer-by-user"]),
-        ).data
-        return get_course_instanse(answer_by_user)
+from . import models
+from .services import CourseInfo, resolve_course
+
+
+def is_owner(user, course: CourseInfo | None) -> bool:
+    """Check that user is owner of course."""
+    return course is not None and course.owner_id == user.id
+
+
+def is_student(user, course: CourseInfo | None) -> bool:
+    """Check that user is student of course with ``READY`` status."""
+    if course is None or course.status != models.Course.Status.READY:
+        return False
+    return models.Course(pk=course.course_id).has_student(user)
 
 
 def get_view(view):
     return "task" if view.basename == "answer-by-user" else view.basename
 
 
+class PermissionContext:
+    """Context of request for permissions.
+
+    `IsStudent` and `IsOwner` are combined by ``|``, so both of them check
+    the same course. Context computes course, ownership, membership and
+    object of request lazily and only once, view reuses fetched object in
+    ``get_object``.
+
+    """
+
+    def __init__(self, request, view):
+        self.request = request
+        self.view = view
+
+    @property
+    def user(self):
+        return self.request.user
+
+    @property
+    def pk(self):
+        return self.view.kwargs.get("pk")
+
+    @cached_property
+    def course(self) -> CourseInfo | None:
+        """Get course of object from url or from data of POST request."""
+        data = (
+            self.request.data
+            if self.request.method == "POST"
+            else {get_view(self.view): self.pk}
+        )
+        return resolve_course(data)
+
+    @cached_property
+    def is_owner(self) -> bool:
+        return is_owner(self.user, self.course)
+
+    @cached_property
+    def is_student(self) -> bool:
+        return is_student(self.user, self.course)
+
+    @cached_property
+    def target(self):
+        """Get object from url or ``None`` if it doesn't exist."""
+        queryset = self.view.get_target_queryset()
+        if self.view.basename == "answer-by-user":
+            return queryset.filter(task_id=self.pk, user_id=self.user.id).first()
+        return queryset.filter(pk=self.pk).first()
+
+    @property
+    def is_author(self) -> bool:
+        """Check that user is author of object from url."""
+        return self.target is not None and self.target.user_id == self.user.id
+
+
+def get_permission_context(request, view) -> PermissionContext:
+    """Get `PermissionContext` of request, create it on first call."""
+    context = getattr(request, "_permission_context", None)
+    if context is None:
+        context = PermissionContext(request, view)
+        request._permission_context = context
+    return context
+
+
 class IsStudent(permissions.BasePermission):
     """Custom permission for let change object by student of course."""
 
     def has_permission(self, request, view) -> bool:
         """Overriden for different student of course and simple user."""
+        context = get_permission_context(request, view)
         match view.basename:
             case "course":
+                if view.action in ("outline", "changes"):
+                    return context.is_student
                 if request.method in ("GET", "POST"):
                     return True
                 if request.method in ("DELETE", "PUT", "PATCH"):
@@ -62,80 +106,23 @@ class IsStudent(permissions.BasePermission):
                 if bool(request.user and request.user.is_authenticated):
                     if request.method in ("POST", "DELETE", "PUT", "PATCH"):
                         return False
-                    data = {view.basename: request.parser_context["kwargs"]["pk"]}
-                    course = get_course_instanse(data)
-                    return all(
-                        [
-                            request.user in course.students.all(),
-                            course.status == models.Course.Status.READY,
-                        ],
-                    )
+                    return context.is_student
             case "comment":
                 if bool(request.user and request.user.is_authenticated):
                     if request.method in ("GET", "POST"):
-                        data = (
-                            request.data
-                            if request.method == "POST"
-                            else {view.basename: request.parser_context["kwargs"]["pk"]}
-                        )
-                        course = get_course_instanse(data)
-                        return all(
-                            [
-                                request.user in course.students.all(),
-                                course.status == models.Course.Status.READY,
-                            ],
-                        )
+                        return context.is_student
                     if request.method in ("DELETE", "PUT", "PATCH"):
-                        comment = models.Comment.objects.get(
-                            id=request.parser_context["kwargs"]["pk"]
-                        )
-                        data = {view.basename: request.parser_context["kwargs"]["pk"]}
-                        course = get_course_instanse(data)
-                        return all(
-                            [
-                                request.user in course.students.all(),
-                                course.status == models.Course.Status.READY,
-                                comment.user == request.user,
-                            ],
-                        )
+                        return context.is_student and context.is_author
             case "review":
                 if request.method == "GET":
                     return True
                 if request.method == "POST":
-                    course = get_course_instanse(request.data)
-                    return all(
-                        [
-                            request.user in course.students.all(),
-                            course.status == models.Course.Status.READY,
-                        ],
-                    )
+                    return context.is_student
                 if request.method in ("DELETE", "PUT", "PATCH"):
-                    review = models.Review.objects.get(
-                        id=request.parser_context["kwargs"]["pk"],
-                    )
-                    data = {view.basename: request.parser_context["kwargs"]["pk"]}
-                    course = get_course_instanse(data)
-                    return all(
-                        [
-                            request.user in course.students.all(),
-                            course.status == models.Course.Status.READY,
-                            review.user == request.user,
-                        ],
-                    )
+                    return context.is_student and context.is_author
             case "answer-by-user":
                 if bool(request.user and request.user.is_authenticated):
-                    data = (
-                        request.data
-                        if request.method == "POST"
-                        else {get_view(view): request.parser_context["kwargs"]["pk"]}
-                    )
-                    course = get_course_instanse(data)
-                    return all(
-                        [
-                            request.user in course.students.all(),
-                            course.status == models.Course.Status.READY,
-                        ],
-                    )
+                    return context.is_student
 
 
 class IsOwner(permissions.BasePermission):
@@ -143,81 +130,38 @@ class IsOwner(permissions.BasePermission):
 
     def has_permission(self, request, view) -> bool:
         """Overriden for different owner of course and simple user."""
+        context = get_permission_context(request, view)
         match view.basename:
             case "course":
+                if view.action in ("outline", "changes"):
+                    return context.is_owner
                 if request.method in ("GET", "POST"):
                     return True
                 if request.method in ("DELETE", "PUT", "PATCH"):
-                    data = {get_view(view): request.parser_context["kwargs"]["pk"]}
-                    course = get_course_instanse(data)
-                    return course.owner == request.user
+                    return context.is_owner
             case "topic":
                 if request.method in ("POST", "DELETE", "PUT", "PATCH"):
-                    data = (
-                        request.data
-                        if request.method == "POST"
-                        else {get_view(view): request.parser_context["kwargs"]["pk"]}
-                    )
-                    course = get_course_instanse(data)
-                    return course.owner == request.user
+                    return context.is_owner
                 return True
             case "task" | "answer":
                 if bool(request.user and request.user.is_authenticated):
-                    data = (
-                        request.data
-                        if request.method == "POST"
-                        else {get_view(view): request.parser_context["kwargs"]["pk"]}
-                    )
-                    course = get_course_instanse(data)
-                    return course.owner == request.user
+                    return context.is_owner
             case "comment":
                 if bool(request.user and request.user.is_authenticated):
                     if request.method in ("GET", "POST"):
-                        data = (
-                            request.data
-                            if request.method == "POST"
-                            else {
-                                get_view(view): request.parser_context["kwargs"]["pk"]
-                            }
-                        )
-                        course = get_course_instanse(data)
-                        return course.owner == request.user
+                        return context.is_owner
                     if request.method in ("DELETE", "PUT", "PATCH"):
-                        comment = models.Comment.objects.get(
-                            id=request.parser_context["kwargs"]["pk"]
-                        )
-                        data = {get_view(view): request.parser_context["kwargs"]["pk"]}
-                        course = get_course_instanse(data)
-                        return course.owner == request.user == comment.user
+                        return context.is_owner and context.is_author
             case "review":
                 if request.method == "GET":
                     return True
                 if request.method == "POST":
-                    course = get_course_instanse(request.data)
-                    return course.owner == request.user
+                    return context.is_owner
                 if request.method in ("DELETE", "PUT", "PATCH"):
-                    review = models.Review.objects.get(
-                        id=request.parser_context["kwargs"]["pk"],
-                    )
-                    data = {get_view(view): request.parser_context["kwargs"]["pk"]}
-                    course = get_course_instanse(data)
-                    return review.user == request.user == course.owner
+                    return context.is_owner and context.is_author
             case "answer-by-user":
                 if bool(request.user and request.user.is_authenticated):
                     if request.method in ("GET", "POST"):
-                        data = (
-                            request.data
-                            if request.method == "POST"
-                            else {
-                                get_view(view): request.parser_context["kwargs"]["pk"]
-                            }
-                        )
-                        course = get_course_instanse(data)
-                        return course.owner == request.user
+                        return context.is_owner
                     if request.method in ("DELETE", "PUT", "PATCH"):
-                        answer = models.AnswerByUser.objects.get(
-                            task_id=request.parser_context["kwargs"]["pk"]
-                        )
-                        data = {get_view(view): request.parser_context["kwargs"]["pk"]}
-                        course = get_course_instanse(data)
-                        return course.owner == request.user == answer.user
+                        return context.is_owner and context.is_author
@@ -1,10 +1,14 @@
 from .courses import (
     AnswerByUserSerializer,
     AnswerSerializer,
+    BatchAnswersSerializer,
+    BulkStudentsSerializer,
     CategorySerializer,
     CommentSerializer,
     CourseSerializer,
+    DiscussionCommentSerializer,
     TaskSerializer,
     TopicSerializer,
 )
+from .outlines import CourseOutlineSerializer
 from .reviews import ReviewSerializer
@@ -1,6 +1,19 @@
-from apps.core.serializers import BaseSerializer, serializers
+from django.db.models import Max
+
+from apps.core.serializers import (
+    BaseSerializer,
+    ExpandableFieldsMixin,
+    LimitedPrimaryKeysField,
+    serializers,
+)
 
 from .. import models
+from ..models.courses import MAX_COMMENT_DEPTH
+
+# Max count of pks of expanded relation
+EXPAND_LIMIT = 100
+# Max count of answers chosen by user in task
+CHOICES_LIMIT = 100
 
 
 class CategorySerializer(BaseSerializer):
@@ -41,11 +54,7 @@ class CourseSerializer(BaseSerializer):
 
     def get_rating(self, obj):
         """Get rating of course."""
-        return (
-            sum([review.rating for review in obj.reviews.all()]) / obj.reviews.count()
-            if obj.reviews.count()
-            else 0
-        )
+        return obj.rating
 
     def validate_status(self, data):
         """Check status when instance create."""
@@ -103,19 +112,23 @@ class TopicSerializer(BaseSerializer):
         )
 
 
-class TaskSerializer(BaseSerializer):
-    """Serializer for representing `Task`."""
+class TaskSerializer(ExpandableFieldsMixin, BaseSerializer):
+    """Serializer for representing `Task`.
+
+    Answers and comments are rendered only by ``?expand=answers,comments``
+    and only first `EXPAND_LIMIT` of them, comments are listed by pages in
+    their own endpoint.
+
+    """
 
     topic = serializers.PrimaryKeyRelatedField(
         queryset=models.Topic.objects.all(),
     )
-    answers = serializers.PrimaryKeyRelatedField(
-        read_only=True,
-        many=True,
+    answers = LimitedPrimaryKeysField(
+        limit=EXPAND_LIMIT,
     )
-    comments = serializers.PrimaryKeyRelatedField(
-        read_only=True,
-        many=True,
+    comments = LimitedPrimaryKeysField(
+        limit=EXPAND_LIMIT,
     )
 
     class Meta:
@@ -130,6 +143,10 @@ class TaskSerializer(BaseSerializer):
             "comments",
             "number",
         )
+        expandable_fields = (
+            "answers",
+            "comments",
+        )
 
 
 class AnswerSerializer(BaseSerializer):
@@ -163,6 +180,42 @@ class CommentSerializer(BaseSerializer):
         read_only=True,
     )
 
+    def validate(self, attrs):
+        """Check parent of comment.
+
+        Parent must be in the same task and not in subtree of comment, and
+        path of the deepest reply must fit into column.
+
+        """
+        parent = attrs.get("parent", getattr(self.instance, "parent", None))
+        task = attrs.get("task", getattr(self.instance, "task", None))
+        if parent is not None:
+            if parent.task_id != task.id:
+                raise serializers.ValidationError(
+                    {"parent": "Parent comment must be in the same task"},
+                )
+            if self.instance is not None and parent.path.startswith(
+                self.instance.path,
+            ):
+                raise serializers.ValidationError(
+                    {"parent": "Comment can't be moved into its replies"},
+                )
+            height = self.get_subtree_height(parent)
+            if parent.depth + 1 + height > MAX_COMMENT_DEPTH:
+                raise serializers.ValidationError(
+                    {"parent": "Thread of comments is too deep"},
+                )
+        return attrs
+
+    def get_subtree_height(self, parent) -> int:
+        """Get depth of the deepest reply under comment, which is moved."""
+        if self.instance is None or self.instance.parent_id == parent.pk:
+            return 0
+        height = models.Comment.objects.filter(
+            path__startswith=self.instance.path,
+        ).aggregate(height=Max("depth"))["height"]
+        return (height or self.instance.depth) - self.instance.depth
+
     class Meta:
         model = models.Comment
         fields = (
@@ -177,6 +230,27 @@ class CommentSerializer(BaseSerializer):
         )
 
 
+class DiscussionCommentSerializer(BaseSerializer):
+    """Serializer for representing `Comment` in discussion of task."""
+
+    user = serializers.PrimaryKeyRelatedField(
+        read_only=True,
+    )
+
+    class Meta:
+        model = models.Comment
+        fields = (
+            "id",
+            "content",
+            "parent",
+            "user",
+            "depth",
+            "created",
+            "modified",
+        )
+        read_only_fields = fields
+
+
 class AnswerByUserSerializer(BaseSerializer):
     """Serializer for representing `AnswerByUser`."""
 
@@ -186,6 +260,35 @@ class AnswerByUserSerializer(BaseSerializer):
     task = serializers.PrimaryKeyRelatedField(
         queryset=models.Task.objects.all(),
     )
+    choices = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=CHOICES_LIMIT,
+    )
+
+    def validate(self, attrs):
+        """Check that answer of task is passed according to type of task.
+
+        Test is graded by server from chosen answers, so answer of user is
+        ignored. Other tasks have no chosen answers and are answered by user.
+        Task from context, e.g. from url, takes priority over task of data.
+
+        """
+        task = self.context.get("task", attrs.get("task"))
+        if task is None:
+            return attrs
+        if task.type_task != models.Task.TypeTask.TEST:
+            if "choices" in attrs:
+                raise serializers.ValidationError(
+                    {"choices": "Chosen answers are allowed only for test"},
+                )
+            return attrs
+        attrs.pop("answer", None)
+        if not self.partial and "choices" not in attrs:
+            raise serializers.ValidationError(
+                {"choices": "Chosen answers are required for test"},
+            )
+        return attrs
 
     class Meta:
         model = models.AnswerByUser
@@ -194,4 +297,48 @@ class AnswerByUserSerializer(BaseSerializer):
             "user",
             "task",
             "answer",
+            "choices",
         )
+
+
+class BulkStudentsSerializer(serializers.Serializer):
+    """Serializer for add or remove many students of course."""
+
+    users = serializers.ListField(
+        child=serializers.CharField(max_length=254),
+        allow_empty=False,
+        max_length=10000,
+    )
+    action = serializers.ChoiceField(
+        choices=("add", "remove"),
+        default="add",
+    )
+
+
+class SubmittedAnswerSerializer(serializers.Serializer):
+    """Serializer for chosen answers of user to one test in batch.
+
+    Answer is graded by server from chosen answers.
+
+    """
+
+    task = serializers.IntegerField(
+        min_value=1,
+    )
+    answer = serializers.BooleanField(
+        read_only=True,
+    )
+    choices = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=CHOICES_LIMIT,
+    )
+
+
+class BatchAnswersSerializer(serializers.Serializer):
+    """Serializer for submit answers of user to many tasks of course."""
+
+    answers = serializers.ListField(
+        child=SubmittedAnswerSerializer(),
+        allow_empty=False,
+        max_length=1000,
+    )
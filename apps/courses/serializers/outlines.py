@@ -0,0 +1,76 @@
+from apps.core.serializers import BaseSerializer
+
+from .. import models
+
+
+class OutlineAnswerSerializer(BaseSerializer):
+    """Serializer for representing `Answer` in outline of course.
+
+    Outline is served to students, so correctness of answer isn't rendered.
+
+    """
+
+    class Meta:
+        model = models.Answer
+        fields = (
+            "id",
+            "content",
+        )
+
+
+class OutlineTaskSerializer(BaseSerializer):
+    """Serializer for representing `Task` in outline of course."""
+
+    answers = OutlineAnswerSerializer(
+        many=True,
+        read_only=True,
+    )
+
+    class Meta:
+        model = models.Task
+        fields = (
+            "id",
+            "type_task",
+            "title",
+            "text",
+            "number",
+            "answers",
+        )
+
+
+class OutlineTopicSerializer(BaseSerializer):
+    """Serializer for representing `Topic` in outline of course."""
+
+    tasks = OutlineTaskSerializer(
+        many=True,
+        read_only=True,
+    )
+
+    class Meta:
+        model = models.Topic
+        fields = (
+            "id",
+            "title",
+            "number",
+            "tasks",
+        )
+
+
+class CourseOutlineSerializer(BaseSerializer):
+    """Serializer for representing `Course` with its topics, tasks, answers."""
+
+    topics = OutlineTopicSerializer(
+        many=True,
+        read_only=True,
+    )
+
+    class Meta:
+        model = models.Course
+        fields = (
+            "id",
+            "name",
+            "description",
+            "status",
+            "topics",
+        )
+        read_only_fields = fields
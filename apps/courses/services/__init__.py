@@ -0,0 +1,34 @@
+from .answers import find_test_tasks, submit_answers, upsert_answers
+from .changes import (
+    bury,
+    decode_cursor,
+    encode_cursor,
+    get_course_changes,
+    get_next_cursor,
+)
+from .discussions import build_threads, get_discussion
+from .grading import get_correct_answers, grade_answers, invalidate_correct_answers
+from .membership import (
+    STUDENTS_COUNT,
+    add_member,
+    add_members,
+    check_students_milestone,
+    enroll_students,
+    find_users,
+    remove_member,
+    remove_members,
+    toggle_member,
+    update_students_count,
+)
+from .notifications import deliver_notifications, dispatch_notifications, notify
+from .ratings import update_course_ratings
+from .resolver import CourseInfo, resolve_course
+from .search import get_search_backend
+from .snapshots import (
+    get_course_snapshot,
+    invalidate_snapshots,
+    prefetch_outline,
+    rebuild_snapshot,
+    schedule_rebuild,
+)
+from .timestamps import touch
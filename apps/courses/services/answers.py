@@ -0,0 +1,95 @@
+from django.db import connections, router
+from django.utils import timezone
+
+from .. import models
+from .grading import grade_answers
+
+# Fields of existing answer, which are replaced by upsert
+UPDATED_FIELDS = ("answer", "choices", "modified")
+
+
+def find_test_tasks(course_id, task_ids) -> set[int]:
+    """Get pks of tasks of course with ``TEST`` type among passed ones."""
+    return set(
+        models.Task.objects.filter(
+            pk__in=task_ids,
+            topic__course_id=course_id,
+            type_task=models.Task.TypeTask.TEST,
+        ).values_list("pk", flat=True),
+    )
+
+
+def upsert_answers(
+    user_id,
+    answers: dict,
+    update: bool = True,
+    choices: dict | None = None,
+) -> list:
+    """Insert or update answers of user to tasks by one statement.
+
+    ``answers`` maps pk of task to answer and ``choices`` maps pk of task
+    to pks of chosen answers. Rows are written by
+    ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` on unique index of
+    (user, task), so concurrent submits don't create duplicates. If
+    ``update`` is false, existing answers are kept as is. Stored choices
+    are updated only if ``choices`` are passed. Return saved answers in
+    order of tasks.
+
+    """
+    model = models.AnswerByUser
+    db = router.db_for_write(model)
+    connection = connections[db]
+    opts = model._meta
+    fields = [field for field in opts.concrete_fields if not field.primary_key]
+    now = timezone.now()
+    params = []
+    for task_id, answer in answers.items():
+        values = {
+            "created": now,
+            "modified": now,
+            "user_id": user_id,
+            "task_id": task_id,
+            "answer": answer,
+            "choices": (choices or {}).get(task_id, []),
+        }
+        params += [
+            field.get_db_prep_save(values[field.attname], connection)
+            for field in fields
+        ]
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in fields)
+    row = f"({', '.join(['%s'] * len(fields))})"
+    user_column = quote(opts.get_field("user").column)
+    task_column = quote(opts.get_field("task").column)
+    if update:
+        updated = [
+            quote(opts.get_field(name).column)
+            for name in UPDATED_FIELDS
+            if name != "choices" or choices is not None
+        ]
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in updated)
+    else:
+        # No-op update, so existing row is returned too
+        assignments = f"{user_column} = excluded.{user_column}"
+    returning = ", ".join(quote(field.column) for field in opts.concrete_fields)
+    sql = (
+        f"INSERT INTO {quote(opts.db_table)} ({columns})"
+        f" VALUES {', '.join([row] * len(answers))}"
+        f" ON CONFLICT ({user_column}, {task_column}) DO UPDATE SET {assignments}"
+        f" RETURNING {returning}"
+    )
+    saved = {
+        instance.task_id: instance
+        for instance in model.objects.raw(sql, params).using(db)
+    }
+    return [saved[task_id] for task_id in answers]
+
+
+def submit_answers(user_id, choices: dict) -> list:
+    """Grade chosen answers and save answers of user by one upsert.
+
+    ``choices`` maps pk of task to pks of chosen answers, answer to task is
+    always its grade.
+
+    """
+    return upsert_answers(user_id, grade_answers(choices), choices=choices)
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Prefetch
+
+from .. import models
+from .resolver import resolve_course
+
+# Kind of changes: model, lookup of course and relations rendered as pks
+CHANGE_FEEDS = {
+    "topics": (models.Topic, "course_id", ("tasks",)),
+    "tasks": (models.Task, "topic__course_id", ()),
+    "answers": (models.Answer, "task__topic__course_id", ()),
+    "comments": (models.Comment, "task__topic__course_id", ("child_comments",)),
+    "reviews": (models.Review, "course_id", ()),
+}
+# Kind of tombstone and parent, which course of deleted object is resolved by
+TOMBSTONE_KINDS = {
+    models.Topic: ("topic", None),
+    models.Task: ("task", "topic"),
+    models.Answer: ("answer", "task"),
+    models.Comment: ("comment", "task"),
+    models.Review: ("review", None),
+}
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+# Next page overlaps previous one, because objects stamped before end of
+# page may be committed after it was read
+CHANGES_OVERLAP = timedelta(seconds=30)
+
+
+def encode_cursor(moment: datetime) -> str:
+    """Get cursor of changes by moment as count of microseconds."""
+    return str((moment - EPOCH) // MICROSECOND)
+
+
+def get_next_cursor(until: datetime) -> str:
+    """Get cursor of next page of changes read until moment.
+
+    Next page starts earlier than ``until`` for catch late committed
+    objects, so clients apply changes idempotently by kind and id.
+
+    """
+    return encode_cursor(until - CHANGES_OVERLAP)
+
+
+def decode_cursor(cursor: str) -> datetime:
+    """Get moment of cursor of changes.
+
+    Raise ``ValueError`` or ``OverflowError`` if cursor is invalid.
+
+    """
+    return EPOCH + int(cursor) * MICROSECOND
+
+
+def prefetch_pks(model, relations):
+    """Get prefetches of pks of reverse relations of model."""
+    prefetches = []
+    for relation in relations:
+        field = model._meta.get_field(relation)
+        prefetches.append(
+            Prefetch(
+                relation,
+                queryset=field.related_model.objects.only("id", field.field.name),
+            ),
+        )
+    return prefetches
+
+
+def get_course_changes(course_id, since: datetime | None, until: datetime) -> dict:
+    """Get querysets of objects of course changed in (since, until].
+
+    Result has querysets of changed objects by kind and queryset of
+    tombstones of deleted objects by ``deleted`` key. Without ``since``
+    all objects are returned and tombstones are skipped.
+
+    """
+    changes = {}
+    for kind, (model, lookup, relations) in CHANGE_FEEDS.items():
+        queryset = model.objects.filter(**{lookup: course_id}, modified__lte=until)
+        if since is not None:
+            queryset = queryset.filter(modified__gt=since)
+        changes[kind] = queryset.prefetch_related(
+            *prefetch_pks(model, relations),
+        ).order_by("modified", "id")
+    tombstones = models.Tombstone.objects.filter(
+        course_id=course_id,
+        created__lte=until,
+    )
+    if since is None:
+        tombstones = tombstones.none()
+    else:
+        tombstones = tombstones.filter(created__gt=since)
+    changes["deleted"] = tombstones.order_by("created", "id")
+    return changes
+
+
+def bury(instance) -> models.Tombstone | None:
+    """Write tombstone of deleted object of course.
+
+    Only the root of cascade of deletion is buried, clients remove children
+    of deleted object together with it.
+
+    """
+    kind, parent = TOMBSTONE_KINDS[type(instance)]
+    if parent is None:
+        course_id = instance.course_id
+    else:
+        course = resolve_course({parent: getattr(instance, f"{parent}_id")})
+        if course is None:
+            return None
+        course_id = course.course_id
+    return models.Tombstone.objects.create(
+        course_id=course_id,
+        kind=kind,
+        object_id=instance.pk,
+    )
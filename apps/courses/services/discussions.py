@@ -0,0 +1,37 @@
+from .. import models
+
+
+def get_discussion(task_id, after=None, size: int = 10, depth=None):
+    """Get comments of page of root threads of task by path order.
+
+    Page contains ``size`` root comments after root with pk ``after``.
+    Comments of their threads are fetched by one range query on path,
+    ``depth`` limits depth of comments. Return list of comments and pk of
+    last root of page if there are more roots.
+
+    """
+    roots = models.Comment.objects.filter(task_id=task_id, depth=0)
+    if after is not None:
+        roots = roots.filter(pk__gt=after)
+    roots = list(roots.order_by("path").values_list("pk", "path")[: size + 1])
+    if not roots:
+        return [], None
+    comments = models.Comment.objects.filter(task_id=task_id, path__gte=roots[0][1])
+    next_root = None
+    if len(roots) > size:
+        comments = comments.filter(path__lt=roots[size][1])
+        next_root = roots[size - 1][0]
+    if depth is not None:
+        comments = comments.filter(depth__lte=depth)
+    return list(comments.order_by("path")), next_root
+
+
+def build_threads(comments, data) -> list[dict]:
+    """Nest serialized comments, which are ordered by path, into threads."""
+    threads = []
+    nodes = {}
+    for comment, item in zip(comments, data):
+        node = nodes[comment.pk] = {**item, "replies": []}
+        parent = nodes.get(comment.parent_id)
+        (parent["replies"] if parent else threads).append(node)
+    return threads
@@ -0,0 +1,58 @@
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .. import models
+
+CORRECT_ANSWERS_TIMEOUT = 60 * 60
+
+
+def get_correct_answers_key(task_id) -> str:
+    """Get cache key of pks of correct answers of task."""
+    return f"grading:task:{task_id}"
+
+
+def get_correct_answers(task_ids) -> dict[int, frozenset[int]]:
+    """Get pks of correct answers of tasks.
+
+    Sets are taken from cache, sets of missed tasks are fetched by one
+    query and cached.
+
+    """
+    keys = {get_correct_answers_key(pk): pk for pk in task_ids}
+    cached = cache.get_many(keys)
+    correct = {keys[key]: frozenset(value) for key, value in cached.items()}
+    missed = [pk for key, pk in keys.items() if key not in cached]
+    if not missed:
+        return correct
+    for pk in missed:
+        correct[pk] = set()
+    answers = models.Answer.objects.filter(task_id__in=missed, is_true=True)
+    for task_id, pk in answers.values_list("task_id", "pk"):
+        correct[task_id].add(pk)
+    cache.set_many(
+        {get_correct_answers_key(pk): sorted(correct[pk]) for pk in missed},
+        CORRECT_ANSWERS_TIMEOUT,
+    )
+    return {pk: frozenset(value) for pk, value in correct.items()}
+
+
+def invalidate_correct_answers(task_ids) -> None:
+    """Drop cached correct answers of tasks after commit."""
+    keys = [get_correct_answers_key(pk) for pk in task_ids]
+    transaction.on_commit(partial(cache.delete_many, keys))
+
+
+def grade_answers(choices: dict) -> dict[int, bool]:
+    """Grade chosen answers of tests in one pass.
+
+    ``choices`` maps pk of task to pks of chosen answers. Task is answered
+    correctly if exactly its correct answers are chosen.
+
+    """
+    correct = get_correct_answers(choices)
+    return {
+        task_id: frozenset(chosen) == correct[task_id]
+        for task_id, chosen in choices.items()
+    }
@@ -0,0 +1,12 @@
+def lock_rows(queryset) -> list:
+    """Lock rows of queryset until end of transaction in order of pks.
+
+    ``FOR NO KEY UPDATE`` doesn't conflict with key share locks, which
+    inserts of rows referencing locked rows take. Return pks of locked rows.
+
+    """
+    return list(
+        queryset.select_for_update(no_key=True)
+        .order_by("pk")
+        .values_list("pk", flat=True),
+    )
@@ -0,0 +1,256 @@
+from django.db import connections, router, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
+
+from apps.core.services import bump_list_version
+from apps.users.models import User
+
+from .. import models
+from .locking import lock_rows
+from .notifications import notify
+from .resolver import CourseInfo
+
+# Lists of course, which are available only for students
+STUDENT_RELATIONS = ("want_pass_users", "archive_users")
+# Owner of course is notified when count of students reaches these values,
+# if one change passes several of them, only the biggest one is announced
+STUDENTS_COUNT = (100, 1000)
+BULK_BATCH_SIZE = 1000
+
+
+def get_through(relation: str):
+    """Get through model and names of its columns for relation of course."""
+    field = models.Course._meta.get_field(relation)
+    through = field.remote_field.through
+    course_column = through._meta.get_field(field.m2m_field_name()).column
+    user_column = through._meta.get_field(field.m2m_reverse_field_name()).column
+    return through, course_column, user_column
+
+
+def send_membership_changed(relation: str, action: str, course_id, user_ids):
+    """Send ``m2m_changed`` like ``add`` and ``remove`` of related manager."""
+    field = models.Course._meta.get_field(relation)
+    m2m_changed.send(
+        sender=field.remote_field.through,
+        instance=models.Course(pk=course_id),
+        action=action,
+        reverse=False,
+        model=field.related_model,
+        pk_set=set(user_ids),
+        using=router.db_for_write(models.Course),
+    )
+
+
+def remove_member(course_id, relation: str, user_id) -> bool:
+    """Remove user from relation of course by one ``DELETE`` statement.
+
+    Removed student is also removed from lists available only for students.
+
+    """
+    through, course_column, user_column = get_through(relation)
+    deleted, _ = through.objects.filter(
+        **{course_column: course_id, user_column: user_id},
+    ).delete()
+    if not deleted:
+        return False
+    send_membership_changed(relation, "post_remove", course_id, [user_id])
+    if relation == "students":
+        for student_relation in STUDENT_RELATIONS:
+            remove_member(course_id, student_relation, user_id)
+    return True
+
+
+def add_member(course_id, relation: str, user_id) -> bool:
+    """Add user to relation of course by one ``INSERT`` statement.
+
+    Row is inserted only if course exists and, for lists available only for
+    students, if user is student of course. Conflict with row, inserted by
+    concurrent request, is ignored. Return ``False`` if user can't be added.
+
+    """
+    through, course_column, user_column = get_through(relation)
+    table = through._meta.db_table
+    condition = ""
+    params = [user_id, course_id]
+    if relation in STUDENT_RELATIONS:
+        students, students_course, students_user = get_through("students")
+        condition = (
+            f" AND EXISTS (SELECT 1 FROM {students._meta.db_table}"
+            f" WHERE {students_course} = %s AND {students_user} = %s)"
+        )
+        params += [course_id, user_id]
+    connection = connections[router.db_for_write(through)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({course_column}, {user_column})"
+            f" SELECT id, %s FROM {models.Course._meta.db_table}"
+            f" WHERE id = %s{condition}"
+            f" ON CONFLICT ({course_column}, {user_column}) DO NOTHING",
+            params,
+        )
+        inserted = cursor.rowcount
+    if inserted:
+        send_membership_changed(relation, "post_add", course_id, [user_id])
+        return True
+    # Row may already be inserted by concurrent request
+    return through.objects.filter(
+        **{course_column: course_id, user_column: user_id},
+    ).exists()
+
+
+def toggle_member(course_id, relation: str, user_id) -> bool | None:
+    """Add user to relation of course or remove user if already there.
+
+    Toggle takes one ``DELETE`` statement and, if nothing was deleted, one
+    ``INSERT ... ON CONFLICT DO NOTHING`` statement, so concurrent requests
+    don't fail on unique index of through table. Return ``True`` if user
+    was added, ``False`` if user was removed and ``None`` if user can't be
+    added.
+
+    """
+    if remove_member(course_id, relation, user_id):
+        return False
+    return True if add_member(course_id, relation, user_id) else None
+
+
+def find_users(identifiers) -> tuple[set[int], list[str]]:
+    """Get ids of users by their ids or emails.
+
+    Return ids of found users and identifiers, which match no user.
+
+    """
+    ids = {int(value) for value in identifiers if value.isdecimal()}
+    emails = {value for value in identifiers if not value.isdecimal()}
+    users = User.objects.filter(Q(pk__in=ids) | Q(email__in=emails)).values_list(
+        "pk",
+        "email",
+    )
+    found = set()
+    user_ids = set()
+    for pk, email in users:
+        user_ids.add(pk)
+        found.update((str(pk), email))
+    return user_ids, [value for value in identifiers if value not in found]
+
+
+def add_members(course_id, relation: str, user_ids) -> set[int]:
+    """Add many users to relation of course.
+
+    Rows are inserted by ``bulk_create`` ignoring conflicts, so rows, which
+    already exist or are inserted concurrently, don't fail request. Return
+    ids of users, which weren't in relation before.
+
+    """
+    through, course_column, user_column = get_through(relation)
+    existing = set(
+        through.objects.filter(
+            **{course_column: course_id, f"{user_column}__in": user_ids},
+        ).values_list(user_column, flat=True),
+    )
+    added = set(user_ids) - existing
+    through.objects.bulk_create(
+        [through(**{course_column: course_id, user_column: pk}) for pk in added],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return added
+
+
+def remove_members(course_id, relation: str, user_ids) -> int:
+    """Remove many users from relation of course by one ``DELETE`` statement.
+
+    Removed students are also removed from lists available only for
+    students. Return count of removed users.
+
+    """
+    through, course_column, user_column = get_through(relation)
+    deleted, _ = through.objects.filter(
+        **{course_column: course_id, f"{user_column}__in": user_ids},
+    ).delete()
+    if deleted and relation == "students":
+        for student_relation in STUDENT_RELATIONS:
+            remove_members(course_id, student_relation, user_ids)
+        update_students_count(models.Course.objects.filter(pk=course_id), -deleted)
+    return deleted
+
+
+def enroll_students(course: CourseInfo, user_ids) -> set[int]:
+    """Add many students to course and notify them through outbox.
+
+    Per-user ``m2m_changed`` isn't sent. New students are notified by one
+    write to outbox and owner is notified if count of students passed new
+    milestone.
+
+    """
+    added = add_members(course.course_id, "students", user_ids)
+    if not added:
+        return added
+    # Concurrent requests may insert the same rows, so count is recalculated
+    update_students_count(models.Course.objects.filter(pk=course.course_id))
+    check_students_milestone(course.course_id)
+    notify(course.course_id, models.CourseNotification.Mode.ENTERED, added)
+    return added
+
+
+def update_students_count(courses, delta: int | None = None) -> int:
+    """Update stored count of students of courses by one ``UPDATE``.
+
+    Count is changed by ``delta`` or recalculated if it isn't passed. For
+    recalculation rows of courses are locked first, so concurrent
+    recalculation counts students of this transaction. Courses are
+    touched, because they render pks of students.
+
+    """
+    bump_list_version(models.Course)
+    if delta is not None:
+        return courses.update(
+            students_count=F("students_count") + delta,
+            modified=timezone.now(),
+        )
+    with transaction.atomic():
+        return recount_students(lock_rows(courses))
+
+
+def recount_students(course_ids) -> int:
+    """Recalculate stored count of students of locked courses."""
+    through, course_column, _ = get_through("students")
+    students = (
+        through.objects.filter(**{course_column: OuterRef("pk")})
+        .order_by()
+        .values(course_column)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return models.Course.objects.filter(pk__in=course_ids).update(
+        students_count=Coalesce(Subquery(students), 0),
+        modified=timezone.now(),
+    )
+
+
+def check_students_milestone(course_id) -> int | None:
+    """Notify owner of course if count of students passed new milestone.
+
+    Milestone is claimed by conditional ``UPDATE`` of course, so it's
+    notified exactly once even for concurrent requests. If count passed
+    several milestones at once, only the biggest of them is notified.
+    Return notified milestone.
+
+    """
+    count, milestone, owner_id = models.Course.objects.values_list(
+        "students_count",
+        "students_milestone",
+        "owner_id",
+    ).get(pk=course_id)
+    passed = [value for value in STUDENTS_COUNT if milestone < value <= count]
+    if not passed:
+        return None
+    claimed = models.Course.objects.filter(
+        pk=course_id,
+        students_milestone__lt=max(passed),
+    ).update(students_milestone=max(passed))
+    if not claimed:
+        return None
+    notify(course_id, models.CourseNotification.Mode.ATTENDANCE, [owner_id])
+    return max(passed)
@@ -0,0 +1,107 @@
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.services import apply_once, release, send_emails
+from apps.users.models import User
+
+from .. import models, tasks
+
+# Notifications of the same course and mode, which are written during this
+# count of seconds, are sent by one dispatch
+NOTIFICATION_WINDOW = 10
+NOTIFICATION_BATCH_SIZE = 50
+
+
+def get_batches(values: list, size: int):
+    """Split list of values to batches of size."""
+    for start in range(0, len(values), size):
+        end = start + size
+        yield values[start:end]
+
+
+def get_dispatch_key(course_id, mode: str) -> str:
+    """Get cache key of scheduled dispatch of notifications."""
+    return f"notifications:{course_id}:{mode}"
+
+
+def notify(course_id, mode: str, user_ids) -> None:
+    """Write notifications to outbox and schedule their dispatch.
+
+    Dispatch is scheduled after commit of current transaction, so worker
+    reads committed notifications and course.
+
+    """
+    models.CourseNotification.objects.bulk_create(
+        [
+            models.CourseNotification(course_id=course_id, mode=mode, user_id=pk)
+            for pk in user_ids
+        ],
+        batch_size=NOTIFICATION_BATCH_SIZE * 20,
+    )
+    transaction.on_commit(partial(schedule_dispatch, course_id, mode))
+
+
+def schedule_dispatch(course_id, mode: str) -> None:
+    """Schedule dispatch of notifications if it isn't scheduled yet."""
+    apply_once(
+        tasks.dispatch_course_notifications,
+        (course_id, mode),
+        get_dispatch_key(course_id, mode),
+        NOTIFICATION_WINDOW,
+    )
+
+
+def dispatch_notifications(course_id, mode: str) -> int:
+    """Send pending notifications of course by chunks of recipients.
+
+    Recipients of pending notifications are split to chunks, each chunk is
+    sent by its own task with retries. Notifications stay pending until
+    their emails are delivered, so chunks, which failed to be enqueued, are
+    sent by next dispatch. Return count of recipients.
+
+    """
+    # Notifications written from now on schedule next dispatch
+    release(get_dispatch_key(course_id, mode))
+    user_ids = sorted(
+        set(
+            models.CourseNotification.objects.filter(
+                course_id=course_id,
+                mode=mode,
+                sent__isnull=True,
+            ).values_list("user_id", flat=True),
+        ),
+    )
+    for chunk in get_batches(user_ids, NOTIFICATION_BATCH_SIZE):
+        tasks.send_email_about_course_to_users.delay(mode, chunk, course_id)
+    return len(user_ids)
+
+
+def deliver_notifications(course_id, mode: str, user_ids) -> int:
+    """Send one email to each of users with pending notifications.
+
+    Notifications are marked as sent only after delivery. Users, whose
+    notifications were delivered by other chunk meanwhile, are skipped, so
+    delivery is at least once. Return count of sent emails.
+
+    """
+    pending = dict(
+        models.CourseNotification.objects.filter(
+            course_id=course_id,
+            mode=mode,
+            user_id__in=user_ids,
+            sent__isnull=True,
+        ).values_list("pk", "user_id"),
+    )
+    if not pending:
+        return 0
+    sent = send_emails(
+        mode,
+        User.objects.filter(pk__in=set(pending.values())),
+        models.Course.objects.get(pk=course_id),
+    )
+    models.CourseNotification.objects.filter(pk__in=pending).update(
+        sent=timezone.now(),
+    )
+    return sent
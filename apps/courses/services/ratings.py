@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.core.services import bump_list_version
+
+from .. import models
+from .locking import lock_rows
+
+
+@transaction.atomic
+def update_course_ratings(courses) -> int:
+    """Recalculate stored rating of courses by one ``UPDATE`` statement.
+
+    Rows of courses are locked first, so ``UPDATE`` of concurrent
+    transaction starts after commit of this one and counts its reviews.
+    Courses are touched, because they render pks of reviews.
+
+    """
+    pks = lock_rows(courses)
+    bump_list_version(models.Course)
+    reviews = (
+        models.Review.objects.filter(course=OuterRef("pk")).order_by().values("course")
+    )
+    return models.Course.objects.filter(pk__in=pks).update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum("rating")).values("total")),
+            0,
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count("id")).values("total")),
+            0,
+        ),
+        modified=timezone.now(),
+    )
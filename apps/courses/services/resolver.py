@@ -0,0 +1,51 @@
+from typing import NamedTuple
+
+from .. import models
+
+
+class CourseInfo(NamedTuple):
+    """Course attributes that permissions need for any object of course."""
+
+    course_id: int
+    owner_id: int
+    status: str
+
+
+# Order matters: it repeats the priority of keys in request data, e.g.
+# comment data has both ``task`` and ``parent`` keys, but course is resolved
+# through ``task``.
+COURSE_LOOKUPS = {
+    "course": (models.Course, ""),
+    "task": (models.Task, "topic__course__"),
+    "topic": (models.Topic, "course__"),
+    "answer": (models.Answer, "task__topic__course__"),
+    "comment": (models.Comment, "task__topic__course__"),
+    "review": (models.Review, "course__"),
+    "answer-by-user": (models.AnswerByUser, "task__topic__course__"),
+}
+
+
+def resolve_course(data) -> CourseInfo | None:
+    """In dependencies of data get `CourseInfo` by one query.
+
+    ``data`` is mapping of kind of object to its pk, for example
+    ``{"task": 1}`` or request data of POST request. Return ``None`` if data
+    hasn't known kind or object doesn't exist.
+
+    """
+    for kind, (model, prefix) in COURSE_LOOKUPS.items():
+        if kind in data:
+            try:
+                row = (
+                    model.objects.filter(pk=data[kind])
+                    .values_list(
+                        f"{prefix}id",
+                        f"{prefix}owner_id",
+                        f"{prefix}status",
+                    )
+                    .first()
+                )
+            except (TypeError, ValueError):
+                return None
+            return CourseInfo(*row) if row else None
+    return None
@@ -0,0 +1,77 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+# Courses are written in different languages, so configuration without
+# stemming is used.
+SEARCH_CONFIG = "simple"
+
+
+class SearchBackend:
+    """Base backend of search of courses."""
+
+    def update(self, courses) -> None:
+        """Update search data of courses after change of them."""
+
+    def search(self, courses, query: str):
+        """Filter courses by search query and order them by rank."""
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Full text search by stored ``tsvector`` of course with GIN index."""
+
+    vector = SearchVector("name", weight="A", config=SEARCH_CONFIG,) + SearchVector(
+        "description",
+        weight="B",
+        config=SEARCH_CONFIG,
+    )
+
+    def update(self, courses) -> None:
+        courses.update(search_vector=self.vector)
+
+    def search(self, courses, query: str):
+        search_query = SearchQuery(
+            query,
+            config=SEARCH_CONFIG,
+            search_type="websearch",
+        )
+        return (
+            courses.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-id")
+        )
+
+
+class SimpleSearchBackend(SearchBackend):
+    """Fallback for databases without full text search, e.g. SQLite.
+
+    Every word of query must be in name or description of course. Matches
+    in name weigh more than matches in description.
+
+    """
+
+    def search(self, courses, query: str):
+        words = query.split()
+        if not words:
+            return courses
+        condition = Q()
+        rank = Value(0)
+        for word in words:
+            condition &= Q(name__icontains=word) | Q(description__icontains=word)
+            rank += Case(
+                When(name__icontains=word, then=Value(2)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        return courses.filter(condition).annotate(rank=rank).order_by("-rank", "-id")
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend() -> SearchBackend:
+    """Get search backend for vendor of database."""
+    return BACKENDS.get(connection.vendor, SimpleSearchBackend)()
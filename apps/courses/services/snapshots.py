@@ -0,0 +1,100 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F, Prefetch
+
+from apps.core.models import untracked_changes
+from apps.core.services import apply_once, release
+
+from .. import models, serializers, tasks
+
+# Changes of course during this count of seconds are rebuilt by one task
+SNAPSHOT_WINDOW = 5
+
+
+def prefetch_outline(queryset):
+    """Prefetch outline of courses by one query per level of tree."""
+    return queryset.defer("search_vector").prefetch_related(
+        Prefetch(
+            "topics",
+            queryset=models.Topic.objects.order_by("number", "id"),
+        ),
+        Prefetch(
+            "topics__tasks",
+            queryset=models.Task.objects.order_by("number", "id"),
+        ),
+        Prefetch(
+            "topics__tasks__answers",
+            queryset=models.Answer.objects.order_by("id"),
+        ),
+    )
+
+
+def get_snapshot_key(course_id) -> str:
+    """Get cache key of scheduled rebuild of snapshot."""
+    return f"snapshot:{course_id}"
+
+
+def get_course_snapshot(course_id) -> models.CourseSnapshot | None:
+    """Get built snapshot of course or ``None`` if it's not ready."""
+    return models.CourseSnapshot.objects.filter(
+        course_id=course_id,
+        data__isnull=False,
+    ).first()
+
+
+def invalidate_snapshots(course_ids) -> None:
+    """Increase version of snapshots of courses and schedule their rebuild.
+
+    Data of snapshots is cleared at once, rebuild is scheduled after commit
+    of current transaction.
+
+    """
+    course_ids = set(course_ids) - {None}
+    if not course_ids:
+        return
+    models.CourseSnapshot.objects.filter(course_id__in=course_ids).update(
+        version=F("version") + 1,
+        data=None,
+    )
+    for course_id in course_ids:
+        transaction.on_commit(partial(schedule_rebuild, course_id))
+
+
+def schedule_rebuild(course_id) -> None:
+    """Schedule rebuild of snapshot if it isn't scheduled yet."""
+    apply_once(
+        tasks.rebuild_course_snapshot,
+        (course_id,),
+        get_snapshot_key(course_id),
+        SNAPSHOT_WINDOW,
+    )
+
+
+def rebuild_snapshot(course_id) -> models.CourseSnapshot | None:
+    """Serialize outline of published course to its snapshot.
+
+    Version is read before outline, so data isn't saved if course changed
+    during rebuild, that change schedules next rebuild. Snapshot of not
+    published course is removed.
+
+    """
+    release(get_snapshot_key(course_id))
+    if not models.Course.objects.filter(
+        pk=course_id,
+        status=models.Course.Status.READY,
+    ).exists():
+        models.CourseSnapshot.objects.filter(course_id=course_id).delete()
+        return None
+    snapshot, _ = models.CourseSnapshot.objects.get_or_create(course_id=course_id)
+    # Objects of outline are only serialized
+    with untracked_changes():
+        course = prefetch_outline(models.Course.objects.filter(pk=course_id)).first()
+        if course is None:
+            return None
+        snapshot.data = serializers.CourseOutlineSerializer(course).data
+    models.CourseSnapshot.objects.filter(
+        course_id=course_id,
+        version=snapshot.version,
+    ).update(data=snapshot.data)
+    return snapshot
@@ -0,0 +1,18 @@
+from django.utils import timezone
+
+from apps.core.services import bump_list_version
+
+
+def touch(model, pks) -> int:
+    """Update ``modified`` of objects by one ``UPDATE`` statement.
+
+    Parent is touched, when its rendered children change, so data cached by
+    ``modified`` of parent and validators of its responses and of lists
+    are invalidated.
+
+    """
+    pks = set(pks) - {None}
+    if not pks:
+        return 0
+    bump_list_version(model)
+    return model.objects.filter(pk__in=pks).update(modified=timezone.now())
@@ -1,27 +1,106 @@
-from django.db.models.signals import m2m_changed, post_delete, post_save
+from functools import wraps
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from . import models, tasks
+from apps.core.services import bump_list_version
+
+from . import models, services
+from .models.deletion import deleted_objects, is_deleted
 
-STUDENTS_COUNT = (100, 1000)
 PATH_DEFAULT_IMAGE = "default/example.jpg"
+SEARCH_FIELDS = {"name", "description"}
+# Foreign keys to parents, which render pks of children
+TOUCHED_PARENTS = {
+    models.Topic: ("course",),
+    models.Task: ("topic",),
+    models.Answer: ("task",),
+    models.Comment: ("task", "parent"),
+}
+
+
+# Foreign keys to parents, which deletion cascades to object
+CASCADE_PARENTS = {
+    models.Topic: ("course",),
+    models.Task: ("topic",),
+    models.Answer: ("task",),
+    models.Comment: ("task", "parent"),
+    models.Review: ("course",),
+}
+
+
+def is_deleted_with_parent(sender, instance) -> bool:
+    """Check that object is deleted by cascade of deletion of its parent."""
+    for field_name in CASCADE_PARENTS[sender]:
+        field = sender._meta.get_field(field_name)
+        if is_deleted(field.related_model, getattr(instance, field.attname)):
+            return True
+    return False
+
+
+def skip_in_cascade(handler):
+    """Skip signal of object, which is deleted together with its parent.
+
+    Parent, which is the root of cascade, touches its own parents, writes
+    tombstone and invalidates snapshot and cached data for the whole
+    cascade, so work for each child is useless writes.
+
+    """
+
+    @wraps(handler)
+    def wrapper(sender, instance, **kwargs):
+        if not is_deleted_with_parent(sender, instance):
+            handler(sender=sender, instance=instance, **kwargs)
+
+    return wrapper
+
+
+@receiver(pre_delete, sender=models.Course)
+@receiver(pre_delete, sender=models.Topic)
+@receiver(pre_delete, sender=models.Task)
+@receiver(pre_delete, sender=models.Comment)
+def collect_deleted_object(sender, instance, **kwargs):
+    """Signal before deletion of parent for skip signals of its children."""
+    deleted = deleted_objects.get()
+    if deleted is not None:
+        deleted.add((sender, instance.pk))
 
 
 @receiver(m2m_changed, sender=models.Course.students.through)
-def check_count_students(instance, action, pk_set, **kwargs):
-    """Signal when student add to course."""
+def check_count_students(instance, action, reverse, pk_set, **kwargs):
+    """Signal when students of course changed for update count of students.
+
+    Count is changed by size of ``pk_set`` on add, which contains only new
+    students, and recalculated on remove and clear.
+
+    """
+    if reverse:
+        # Instance is user, ``pk_set`` contains ids of courses
+        if action == "pre_clear":
+            instance.cleared_courses = list(
+                instance.courses_student.values_list("pk", flat=True),
+            )
+            return
+        if pk_set is None:
+            pk_set = instance.__dict__.pop("cleared_courses", [])
+        course_ids, user_ids = pk_set, [instance.pk]
+    else:
+        course_ids, user_ids = [instance.pk], pk_set
+    courses = models.Course.objects.filter(pk__in=course_ids)
     if action == "post_add":
-        if instance.students.count() in STUDENTS_COUNT:
-            tasks.send_email_about_course.delay(
-                "attendance",
-                instance.owner.id,
-                instance.id,
+        if reverse:
+            services.update_students_count(courses, 1)
+        else:
+            services.update_students_count(courses, len(pk_set))
+        for course_id in course_ids:
+            services.check_students_milestone(course_id)
+            services.notify(
+                course_id,
+                models.CourseNotification.Mode.ENTERED,
+                user_ids,
             )
-        tasks.send_email_about_course.delay(
-            "entered",
-            list(pk_set)[0],
-            instance.id,
-        )
+    if action in ("post_remove", "post_clear"):
+        services.update_students_count(courses)
 
 
 @receiver(post_save, sender=models.Course)
@@ -30,10 +109,19 @@ def check_status_of_course(instance, created, update_fields, **kwargs):
     is_ready_status = instance.status == models.Course.Status.READY
     updated = "status" in update_fields if update_fields else False
     if is_ready_status and (created or updated):
-        tasks.send_email_about_course.delay(
-            "create",
-            instance.owner.id,
-            instance.id,
+        services.notify(
+            instance.pk,
+            models.CourseNotification.Mode.CREATE,
+            [instance.owner_id],
+        )
+
+
+@receiver(post_save, sender=models.Course)
+def update_search_of_course(instance, created, update_fields, **kwargs):
+    """Signal when course save for update its search data."""
+    if created or update_fields is None or SEARCH_FIELDS & set(update_fields):
+        services.get_search_backend().update(
+            models.Course.objects.filter(pk=instance.pk),
         )
 
 
@@ -42,3 +130,106 @@ def delete_img_of_course_after_delete(instance, **kwargs):
     """Signal when course has deleted."""
     if not str(instance.image).endswith(PATH_DEFAULT_IMAGE):
         instance.image.storage.delete(instance.image.path)
+
+
+@receiver([post_save, post_delete], sender=models.Course)
+def bump_version_of_courses(**kwargs):
+    """Signal when course saved or deleted for change ETag of its lists."""
+    bump_list_version(models.Course)
+
+
+@receiver(post_delete, sender=models.Course)
+def delete_tombstones_of_course(instance, **kwargs):
+    """Signal when course deleted for remove tombstones of its objects."""
+    models.Tombstone.objects.filter(course_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=models.Review)
+@receiver(post_delete, sender=models.Review)
+@skip_in_cascade
+def update_rating_of_course(instance, **kwargs):
+    """Signal when review changed for update stored rating of course."""
+    course_ids = {
+        instance.course_id,
+        instance.get_previous_value("course_id"),
+    }
+    services.update_course_ratings(
+        models.Course.objects.filter(pk__in=course_ids - {None}),
+    )
+
+
+@receiver(post_save, sender=models.Topic)
+@receiver(post_delete, sender=models.Topic)
+@receiver(post_save, sender=models.Task)
+@receiver(post_delete, sender=models.Task)
+@receiver(post_save, sender=models.Answer)
+@receiver(post_delete, sender=models.Answer)
+@receiver(post_save, sender=models.Comment)
+@receiver(post_delete, sender=models.Comment)
+@skip_in_cascade
+def touch_parent(sender, instance, **kwargs):
+    """Signal when rendered child changed for touch its parents."""
+    for field_name in TOUCHED_PARENTS[sender]:
+        field = sender._meta.get_field(field_name)
+        services.touch(
+            field.related_model,
+            [
+                getattr(instance, field.attname),
+                instance.get_previous_value(field.attname),
+            ],
+        )
+
+
+@receiver(post_save, sender=models.Course)
+def invalidate_snapshot_of_course(instance, **kwargs):
+    """Signal when course save for invalidate snapshot of published course."""
+    if instance.status == models.Course.Status.READY:
+        services.invalidate_snapshots([instance.pk])
+
+
+@receiver(post_save, sender=models.Topic)
+@receiver(post_delete, sender=models.Topic)
+@skip_in_cascade
+def invalidate_snapshot_of_topic(instance, **kwargs):
+    """Signal when topic changed for invalidate snapshot of course."""
+    services.invalidate_snapshots(
+        [instance.course_id, instance.get_previous_value("course_id")],
+    )
+
+
+@receiver(post_save, sender=models.Task)
+@receiver(post_delete, sender=models.Task)
+@receiver(post_save, sender=models.Answer)
+@receiver(post_delete, sender=models.Answer)
+@skip_in_cascade
+def invalidate_snapshot_of_content(sender, instance, **kwargs):
+    """Signal when task or answer changed for invalidate snapshot of course."""
+    kind = "topic" if sender is models.Task else "task"
+    parents = {
+        getattr(instance, f"{kind}_id"),
+        instance.get_previous_value(f"{kind}_id"),
+    }
+    courses = [services.resolve_course({kind: pk}) for pk in parents - {None}]
+    services.invalidate_snapshots(
+        [course.course_id for course in courses if course is not None],
+    )
+
+
+@receiver(post_save, sender=models.Answer)
+@receiver(post_delete, sender=models.Answer)
+@skip_in_cascade
+def invalidate_correct_answers_of_task(instance, **kwargs):
+    """Signal when answer changed for drop cached correct answers of task."""
+    tasks = {instance.task_id, instance.get_previous_value("task_id")}
+    services.invalidate_correct_answers(tasks - {None})
+
+
+@receiver(post_delete, sender=models.Topic)
+@receiver(post_delete, sender=models.Task)
+@receiver(post_delete, sender=models.Answer)
+@receiver(post_delete, sender=models.Comment)
+@receiver(post_delete, sender=models.Review)
+@skip_in_cascade
+def bury_deleted_object(instance, **kwargs):
+    """Signal when object of course deleted for write its tombstone."""
+    services.bury(instance)
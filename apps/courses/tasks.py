@@ -1,7 +1,12 @@
+from smtplib import SMTPException
+
+from kombu.exceptions import OperationalError
+
 from apps.core.services import send_email
 from apps.users.models import User
 from config.celery_app import app
 
+from . import services
 from .models import Course
 
 
@@ -17,3 +22,44 @@ def send_email_about_course(
         User.objects.get(pk=user_id),
         Course.objects.get(pk=course_id),
     )
+
+
+@app.task(
+    task_ignore_result=True,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def dispatch_course_notifications(
+    course_id: int,
+    mode: str,
+) -> None:
+    """Send pending notifications of course from outbox."""
+    services.dispatch_notifications(course_id, mode)
+
+
+@app.task(task_ignore_result=True)
+def rebuild_course_snapshot(
+    course_id: int,
+) -> None:
+    """Rebuild serialized outline of course."""
+    services.rebuild_snapshot(course_id)
+
+
+@app.task(
+    task_ignore_result=True,
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    max_retries=3,
+)
+def send_email_about_course_to_users(
+    mode: str,
+    user_ids: list[int],
+    course_id: int,
+) -> None:
+    """Send notifications about course to chunk of users by one connection.
+
+    Chunk is retried as whole if email backend fails.
+
+    """
+    services.deliver_notifications(course_id, mode, user_ids)
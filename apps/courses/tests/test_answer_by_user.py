@@ -2,7 +2,7 @@ import pytest
 from django.urls import reverse_lazy
 from rest_framework import status
 
-from apps.courses import factories, models
+from apps.courses import factories, models, services
 
 pytestmark = pytest.mark.django_db
 
@@ -21,26 +21,24 @@ def test_create_answer_by_user_by_student(
     )
     task = factories.TaskFactory.create(
         topic=topic,
+        type_task=models.Task.TypeTask.TEST,
     )
+    right = factories.AnswerFactory.create(task=task, is_true=True)
     course.students.add(user)
-    answer_by_user = factories.AnswerByUserFactory.build(
-        user=user,
-        task=task,
-    )
     api_client.force_authenticate(user=user)
     response = api_client.post(
         reverse_lazy("api:answer-by-user-list"),
         data={
-            "task": answer_by_user.task.id,
-            "user": answer_by_user.user.id,
-            "answer": answer_by_user.answer,
+            "task": task.id,
+            "user": user.id,
+            "choices": [right.pk],
         },
     )
     assert response.status_code == status.HTTP_201_CREATED
     assert models.AnswerByUser.objects.filter(
-        task=answer_by_user.task.id,
-        user=answer_by_user.user.id,
-        answer=answer_by_user.answer,
+        task=task.id,
+        user=user.id,
+        answer=True,
     ).exists()
 
 
@@ -202,14 +200,16 @@ def test_update_answer_by_user_by_student(
     )
     task = factories.TaskFactory.create(
         topic=topic,
+        type_task=models.Task.TypeTask.TEST,
     )
+    right = factories.AnswerFactory.create(task=task, is_true=True)
     answer_by_user = factories.AnswerByUserFactory.create(
         user=user,
         task=task,
+        answer=False,
     )
     course.students.add(user)
     api_client.force_authenticate(user=user)
-    answer = not answer_by_user.answer
     response = api_client.put(
         reverse_lazy(
             "api:answer-by-user-detail",
@@ -218,12 +218,291 @@ def test_update_answer_by_user_by_student(
         data={
             "task": answer_by_user.task.id,
             "user": answer_by_user.user.id,
-            "answer": answer,
+            "choices": [right.pk],
         },
+        format="json",
     )
     assert response.status_code == status.HTTP_200_OK
     assert models.AnswerByUser.objects.filter(
         task=answer_by_user.task.id,
         user=answer_by_user.user.id,
-        answer=answer,
+        answer=True,
     ).exists()
+
+
+def test_submit_answer_by_user_twice(
+    user,
+    api_client,
+) -> None:
+    """Test that repeated submit updates the same answer."""
+    task = factories.TaskFactory.create(
+        topic__course__status=models.Course.Status.READY,
+        type_task=models.Task.TypeTask.TEST,
+    )
+    right = factories.AnswerFactory.create(task=task, is_true=True)
+    task.topic.course.students.add(user)
+    api_client.force_authenticate(user=user)
+    for choices, answer in (([], False), ([right.pk], True)):
+        response = api_client.post(
+            reverse_lazy("api:answer-by-user-list"),
+            data={"task": task.id, "choices": choices},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["answer"] is answer
+    answers = models.AnswerByUser.objects.filter(task=task, user=user)
+    assert list(answers.values_list("answer", flat=True)) == [True]
+
+
+def test_update_answer_by_user_by_one_statement(
+    user,
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    """Test that answer is saved by one statement without fetch."""
+    task = factories.TaskFactory.create(
+        topic__course__status=models.Course.Status.READY,
+        type_task=models.Task.TypeTask.TEST,
+    )
+    right = factories.AnswerFactory.create(task=task, is_true=True)
+    task.topic.course.students.add(user)
+    url = reverse_lazy("api:answer-by-user-detail", kwargs={"pk": task.pk})
+    api_client.force_authenticate(user=user)
+    services.grade_answers({task.pk: []})
+    # Savepoints, course of task, student, type of task, upsert
+    with django_assert_num_queries(6):
+        response = api_client.patch(
+            url,
+            data={"choices": [right.pk]},
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["answer"] is True
+    response = api_client.get(url)
+    assert response.data["answer"] is True
+    assert models.AnswerByUser.objects.filter(task=task, user=user).count() == 1
+
+
+def test_submit_answers_in_batch(
+    user,
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    """Test submit of answers to many tests of course by one request."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    tasks = factories.TaskFactory.create_batch(
+        3,
+        topic__course=course,
+        type_task=models.Task.TypeTask.TEST,
+    )
+    factories.AnswerByUserFactory.create(user=user, task=tasks[0], answer=False)
+    api_client.force_authenticate(user=user)
+    # Savepoints, course, student, tasks, correct answers, upsert
+    with django_assert_num_queries(7):
+        response = api_client.post(
+            reverse_lazy("courses:submit-answers", kwargs={"pk": course.pk}),
+            data={"answers": [{"task": task.pk, "choices": []} for task in tasks]},
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["task"] for item in response.data["answers"]] == [
+        task.pk for task in tasks
+    ]
+    answers = models.AnswerByUser.objects.filter(user=user)
+    assert answers.count() == 3
+    assert set(answers.values_list("answer", flat=True)) == {True}
+
+
+def test_submit_answers_in_batch_to_other_course(
+    user,
+    api_client,
+) -> None:
+    """Test that batch with task of other course is rejected."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    task = factories.TaskFactory.create(
+        topic__course=course,
+        type_task=models.Task.TypeTask.TEST,
+    )
+    other = factories.TaskFactory.create(type_task=models.Task.TypeTask.TEST)
+    api_client.force_authenticate(user=user)
+    response = api_client.post(
+        reverse_lazy("courses:submit-answers", kwargs={"pk": course.pk}),
+        data={
+            "answers": [
+                {"task": task.pk, "choices": []},
+                {"task": other.pk, "choices": []},
+            ],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not models.AnswerByUser.objects.exists()
+
+
+def test_submit_answers_in_batch_by_not_student(
+    user,
+    api_client,
+) -> None:
+    """Test that not student can't submit answers."""
+    task = factories.TaskFactory.create(
+        topic__course__status=models.Course.Status.READY,
+        type_task=models.Task.TypeTask.TEST,
+    )
+    api_client.force_authenticate(user=user)
+    response = api_client.post(
+        reverse_lazy(
+            "courses:submit-answers",
+            kwargs={"pk": task.topic.course_id},
+        ),
+        data={"answers": [{"task": task.pk, "choices": []}]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_grade_answers_from_cached_correct_answers(
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+) -> None:
+    """Test grading by cached correct answers, which are dropped on change."""
+    task = factories.TaskFactory.create(type_task=models.Task.TypeTask.TEST)
+    right = factories.AnswerFactory.create(task=task, is_true=True)
+    wrong = factories.AnswerFactory.create(task=task, is_true=False)
+    other = factories.TaskFactory.create(type_task=models.Task.TypeTask.TEST)
+    with django_assert_num_queries(1):
+        grades = services.grade_answers({task.pk: [right.pk], other.pk: []})
+    assert grades == {task.pk: True, other.pk: True}
+    with django_assert_num_queries(0):
+        grades = services.grade_answers({task.pk: [right.pk, wrong.pk]})
+    assert grades == {task.pk: False}
+    with django_capture_on_commit_callbacks(execute=True):
+        wrong.is_true = True
+        wrong.save()
+    assert services.grade_answers({task.pk: [right.pk, wrong.pk]}) == {
+        task.pk: True,
+    }
+
+
+def test_submit_chosen_answers_in_batch(
+    user,
+    api_client,
+) -> None:
+    """Test that chosen answers are graded by server, answer is ignored."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    tasks = factories.TaskFactory.create_batch(
+        2,
+        topic__course=course,
+        type_task=models.Task.TypeTask.TEST,
+    )
+    answers = [
+        factories.AnswerFactory.create(task=task, is_true=True) for task in tasks
+    ]
+    api_client.force_authenticate(user=user)
+    url = reverse_lazy("courses:submit-answers", kwargs={"pk": course.pk})
+    response = api_client.post(
+        url,
+        data={"answers": [{"task": task.pk, "answer": True} for task in tasks]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.post(
+        url,
+        data={
+            "answers": [
+                {"task": tasks[0].pk, "choices": [answers[0].pk]},
+                {"task": tasks[1].pk, "choices": [], "answer": True},
+            ],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["answer"] for item in response.data["answers"]] == [True, False]
+    assert (response.data["score"], response.data["total"]) == (1, 2)
+    saved = models.AnswerByUser.objects.get(user=user, task=tasks[0])
+    assert saved.choices == [answers[0].pk]
+
+
+def test_update_answer_by_user_with_choices(
+    user,
+    api_client,
+) -> None:
+    """Test that answer of single task is graded from chosen answers."""
+    task = factories.TaskFactory.create(
+        topic__course__status=models.Course.Status.READY,
+        type_task=models.Task.TypeTask.TEST,
+    )
+    task.topic.course.students.add(user)
+    right = factories.AnswerFactory.create(task=task, is_true=True)
+    api_client.force_authenticate(user=user)
+    response = api_client.patch(
+        reverse_lazy("api:answer-by-user-detail", kwargs={"pk": task.pk}),
+        data={"choices": [right.pk]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["answer"] is True
+    assert response.data["choices"] == [right.pk]
+
+
+def test_answer_by_user_is_graded_only_from_choices(
+    user,
+    api_client,
+) -> None:
+    """Test that answer of user isn't accepted and choices are kept."""
+    task = factories.TaskFactory.create(
+        topic__course__status=models.Course.Status.READY,
+        type_task=models.Task.TypeTask.TEST,
+    )
+    task.topic.course.students.add(user)
+    factories.AnswerFactory.create(task=task, is_true=True)
+    wrong = factories.AnswerFactory.create(task=task, is_true=False)
+    api_client.force_authenticate(user=user)
+    response = api_client.post(
+        reverse_lazy("api:answer-by-user-list"),
+        data={"task": task.pk, "answer": True},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    url = reverse_lazy("api:answer-by-user-detail", kwargs={"pk": task.pk})
+    api_client.patch(url, data={"choices": [wrong.pk]}, format="json")
+    response = api_client.patch(url, data={"answer": True}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["answer"] is False
+    saved = models.AnswerByUser.objects.get(user=user, task=task)
+    assert (saved.answer, saved.choices) == (False, [wrong.pk])
+
+
+def test_answer_by_user_to_information_task(
+    user,
+    api_client,
+) -> None:
+    """Test that answer to information task is written by user."""
+    task = factories.TaskFactory.create(
+        topic__course__status=models.Course.Status.READY,
+        type_task=models.Task.TypeTask.INFORMATION,
+    )
+    task.topic.course.students.add(user)
+    api_client.force_authenticate(user=user)
+    url = reverse_lazy("api:answer-by-user-detail", kwargs={"pk": task.pk})
+    response = api_client.patch(url, data={"answer": True}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["answer"] is True
+    response = api_client.patch(url, data={"choices": []}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.post(
+        reverse_lazy("api:answer-by-user-list"),
+        data={"task": task.pk, "choices": []},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    saved = models.AnswerByUser.objects.get(user=user, task=task)
+    assert (saved.answer, saved.choices) == (True, [])
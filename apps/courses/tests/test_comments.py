@@ -2,6 +2,7 @@ import pytest
 from django.urls import reverse_lazy
 from rest_framework import status
 
+from apps.core.models import untracked_changes
 from apps.courses import factories, models
 
 pytestmark = pytest.mark.django_db
@@ -282,3 +283,208 @@ def test_owner_course_read_comment(
         reverse_lazy("api:comment-detail", kwargs={"pk": comment.pk}),
     )
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_student_read_comment_num_queries(
+    user,
+    api_client,
+    django_assert_max_num_queries,
+) -> None:
+    """Test read comment by student costs fixed number of queries."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    topic = factories.TopicFactory.create(
+        course=course,
+    )
+    task = factories.TaskFactory.create(
+        topic=topic,
+    )
+    comment = factories.CommentFactory.create(
+        task=task,
+    )
+    api_client.force_authenticate(user=user)
+    # savepoint and its release of atomic request, course, membership,
+    # comment and its child comments
+    with django_assert_max_num_queries(6):
+        response = api_client.get(
+            reverse_lazy("api:comment-detail", kwargs={"pk": comment.pk}),
+        )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_comment_path_of_thread() -> None:
+    """Test materialized path and depth of comments in thread."""
+    root = factories.CommentFactory.create()
+    reply = factories.CommentFactory.create(task=root.task, parent=root)
+    reply.refresh_from_db()
+    assert root.path == f"{root.pk:010d}/"
+    assert reply.path == f"{root.pk:010d}/{reply.pk:010d}/"
+    assert (root.depth, reply.depth) == (0, 1)
+
+
+def test_move_comment_rewrites_subtree() -> None:
+    """Test that move of comment rewrites paths of its replies."""
+    first = factories.CommentFactory.create()
+    second = factories.CommentFactory.create(task=first.task)
+    reply = factories.CommentFactory.create(task=first.task, parent=first)
+    nested = factories.CommentFactory.create(task=first.task, parent=reply)
+    reply.parent = second
+    reply.save()
+    nested.refresh_from_db()
+    assert nested.path == f"{second.path}{reply.pk:010d}/{nested.pk:010d}/"
+    assert nested.depth == 2
+    with pytest.raises(ValueError):
+        reply.parent = nested
+        reply.save()
+
+
+def test_save_reply_without_snapshot_keeps_path() -> None:
+    """Test that reply saved without known parent isn't moved."""
+    root = factories.CommentFactory.create()
+    reply = factories.CommentFactory.create(task=root.task, parent=root)
+    path = f"{root.pk:010d}/{reply.pk:010d}/"
+    with untracked_changes():
+        untracked = models.Comment.objects.get(pk=reply.pk)
+        untracked.content = "Untracked"
+        untracked.save()
+    assert untracked.path == path
+    deferred = models.Comment.objects.only(
+        "id",
+        "content",
+        "path",
+        "depth",
+        "task",
+    ).get(pk=reply.pk)
+    deferred.content = "Deferred"
+    deferred.save()
+    reply.refresh_from_db()
+    assert (reply.content, reply.path, reply.depth) == ("Deferred", path, 1)
+
+
+def test_save_moved_reply_without_snapshot() -> None:
+    """Test that reply moved without snapshot rewrites its subtree."""
+    first = factories.CommentFactory.create()
+    second = factories.CommentFactory.create(task=first.task)
+    reply = factories.CommentFactory.create(task=first.task, parent=first)
+    nested = factories.CommentFactory.create(task=first.task, parent=reply)
+    with untracked_changes():
+        reply = models.Comment.objects.get(pk=reply.pk)
+        reply.parent = second
+        reply.save()
+    nested.refresh_from_db()
+    assert nested.path == f"{second.path}{reply.pk:010d}/{nested.pk:010d}/"
+
+
+def test_create_comment_in_too_deep_thread(
+    user,
+    api_client,
+    monkeypatch,
+) -> None:
+    """Test that depth of thread of comments is limited."""
+    monkeypatch.setattr("apps.courses.serializers.courses.MAX_COMMENT_DEPTH", 1)
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    task = factories.TaskFactory.create(topic__course=course)
+    root = factories.CommentFactory.create(task=task, user=user)
+    reply = factories.CommentFactory.create(task=task, parent=root)
+    other = factories.CommentFactory.create(task=task, user=user)
+    factories.CommentFactory.create(task=task, parent=other)
+    api_client.force_authenticate(user=user)
+    response = api_client.post(
+        reverse_lazy("api:comment-list"),
+        data={"content": "Reply", "task": task.pk, "parent": reply.pk},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.patch(
+        reverse_lazy("api:comment-detail", kwargs={"pk": other.pk}),
+        data={"parent": root.pk},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.post(
+        reverse_lazy("api:comment-list"),
+        data={"content": "Reply", "task": task.pk, "parent": root.pk},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_delete_comment_with_replies() -> None:
+    """Test deletion of comment buries only it and touches its task."""
+    root = factories.CommentFactory.create()
+    factories.CommentFactory.create_batch(size=3, task=root.task, parent=root)
+    other = factories.CommentFactory.create(task=root.task)
+    models.Task.objects.filter(pk=root.task_id).update(modified=other.created)
+    root_pk = root.pk
+    root.delete()
+    assert list(models.Comment.objects.all()) == [other]
+    assert list(models.Tombstone.objects.values_list("kind", "object_id")) == [
+        ("comment", root_pk),
+    ]
+    assert models.Task.objects.get(pk=other.task_id).modified > other.created
+
+
+def test_update_comment_parent_into_replies(
+    user,
+    api_client,
+) -> None:
+    """Test that comment can't be moved into its replies by API."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    task = factories.TaskFactory.create(topic__course=course)
+    root = factories.CommentFactory.create(task=task, user=user)
+    reply = factories.CommentFactory.create(task=task, parent=root)
+    api_client.force_authenticate(user=user)
+    response = api_client.patch(
+        reverse_lazy("api:comment-detail", kwargs={"pk": root.pk}),
+        data={"parent": reply.pk},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    other = factories.CommentFactory.create()
+    response = api_client.patch(
+        reverse_lazy("api:comment-detail", kwargs={"pk": root.pk}),
+        data={"parent": other.pk},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_task_discussion(
+    user,
+    api_client,
+    django_assert_num_queries,
+    monkeypatch,
+) -> None:
+    """Test threads of discussion of task by pages of root comments."""
+    monkeypatch.setattr(
+        "apps.courses.views.TaskViewSet.discussion_page_size",
+        2,
+    )
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    task = factories.TaskFactory.create(topic__course=course)
+    roots = factories.CommentFactory.create_batch(3, task=task)
+    reply = factories.CommentFactory.create(task=task, parent=roots[0])
+    nested = factories.CommentFactory.create(task=task, parent=reply)
+    factories.CommentFactory.create(task=task, parent=roots[2])
+    url = reverse_lazy("api:task-discussion", kwargs={"pk": task.pk})
+    api_client.force_authenticate(user=user)
+    # Savepoints, task, student, roots, comments of threads
+    with django_assert_num_queries(6):
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    results = response.data["results"]
+    assert [item["id"] for item in results] == [roots[0].pk, roots[1].pk]
+    assert results[0]["replies"][0]["id"] == reply.pk
+    assert results[0]["replies"][0]["replies"][0]["id"] == nested.pk
+    response = api_client.get(response.data["links"]["next"])
+    assert [item["id"] for item in response.data["results"]] == [roots[2].pk]
+    assert len(response.data["results"][0]["replies"]) == 1
+    assert response.data["links"]["next"] is None
+    response = api_client.get(url, {"depth": 1})
+    assert response.data["results"][0]["replies"][0]["replies"] == []
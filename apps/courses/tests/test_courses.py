@@ -1,8 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from threading import Barrier
+
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
+from django.utils import timezone
 from rest_framework import status
 
-from apps.courses import factories, models
+from apps.core.models import untracked_changes
+from apps.courses import factories, models, services
+from apps.users.factories import UserFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -162,6 +173,143 @@ def test_add_and_remove_student(
     assert user not in course.students.all()
 
 
+def test_toggle_interest_num_queries(
+    user,
+    django_assert_num_queries,
+) -> None:
+    """Test toggle of interest takes only delete and insert statements."""
+    course = factories.CourseFactory.create()
+    with django_assert_num_queries(2):
+        assert services.toggle_member(course.pk, "interest_users", user.pk)
+    with django_assert_num_queries(1):
+        assert not services.toggle_member(course.pk, "interest_users", user.pk)
+    assert services.toggle_member(0, "interest_users", user.pk) is None
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="Concurrent writers lock the whole database in SQLite",
+)
+@pytest.mark.django_db(transaction=True)
+def test_toggle_student_concurrently(
+    user,
+) -> None:
+    """Test concurrent toggles of student don't fail and don't duplicate."""
+    course = factories.CourseFactory.create()
+    size = 4
+    barrier = Barrier(size)
+
+    def toggle():
+        barrier.wait()
+        try:
+            return services.toggle_member(course.pk, "students", user.pk)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=size) as executor:
+        results = [executor.submit(toggle) for _ in range(size)]
+        results = [result.result() for result in results]
+    assert None not in results
+    assert course.students.filter(pk=user.pk).count() <= 1
+
+
+def test_bulk_students(
+    user,
+    api_client,
+) -> None:
+    """Test owner adds and removes many students by one request."""
+    course = factories.CourseFactory.create(owner=user)
+    student, *users = UserFactory.create_batch(size=4)
+    course.students.add(student)
+    url = reverse_lazy("courses:bulk-students", kwargs={"pk": course.pk})
+    api_client.force_authenticate(user=user)
+    response = api_client.post(
+        url,
+        data={
+            "users": [
+                str(student.pk),
+                str(users[0].pk),
+                users[1].email,
+                users[2].email,
+                "unknown@example.com",
+            ],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 3
+    assert response.data["not_found"] == ["unknown@example.com"]
+    course.refresh_from_db()
+    assert course.students.count() == course.students_count == 4
+    notifications = models.CourseNotification.objects.filter(
+        course=course,
+        mode=models.CourseNotification.Mode.ENTERED,
+    )
+    assert sorted(notifications.values_list("user_id", flat=True)) == sorted(
+        [student.pk, *(user.pk for user in users)],
+    )
+    response = api_client.post(
+        url,
+        data={"users": [str(student.pk)], "action": "remove"},
+        format="json",
+    )
+    assert response.data["count"] == 1
+    assert not course.students.filter(pk=student.pk).exists()
+
+
+def test_bulk_students_with_not_ascii_digits(
+    user,
+    api_client,
+) -> None:
+    """Test that identifiers with not ascii digits aren't server error."""
+    course = factories.CourseFactory.create(owner=user)
+    api_client.force_authenticate(user=user)
+    response = api_client.post(
+        reverse_lazy("courses:bulk-students", kwargs={"pk": course.pk}),
+        data={"users": ["\u00b2", "\u0660"]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["not_found"] == ["\u00b2", "\u0660"]
+
+
+def test_students_count_is_recalculated_under_lock(
+    monkeypatch,
+) -> None:
+    """Test that course is locked before its count of students is recounted."""
+    locked = []
+
+    def lock_rows(queryset):
+        pks = services.locking.lock_rows(queryset)
+        locked.append(pks)
+        return pks
+
+    monkeypatch.setattr(services.membership, "lock_rows", lock_rows)
+    course = factories.CourseFactory.create()
+    users = UserFactory.create_batch(size=2)
+    course.students.add(*users)
+    course.students.remove(users[0])
+    assert locked == [[course.pk]]
+    course.refresh_from_db()
+    assert course.students_count == 1
+
+
+def test_bulk_students_by_not_owner(
+    user,
+    api_client,
+) -> None:
+    """Test only owner of course adds many students."""
+    course = factories.CourseFactory.create()
+    api_client.force_authenticate(user=user)
+    response = api_client.post(
+        reverse_lazy("courses:bulk-students", kwargs={"pk": course.pk}),
+        data={"users": [str(user.pk)]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert not course.students.exists()
+
+
 def test_add_and_remove_interest(
     user,
     api_client,
@@ -348,3 +496,422 @@ def test_owner_read_course(
         )
     )
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_course_membership(
+    user,
+    django_assert_num_queries,
+) -> None:
+    """Test membership of user is checked by one query."""
+    course = factories.CourseFactory.create()
+    course.students.add(*UserFactory.create_batch(size=5))
+    with django_assert_num_queries(1):
+        assert not course.has_student(user)
+    course.students.add(user)
+    with django_assert_num_queries(1):
+        assert course.has_student(user)
+    assert not course.is_member("archive_users", user)
+
+
+def test_list_courses_num_queries(
+    api_client,
+) -> None:
+    """Test list of courses costs the same queries for any size of page."""
+
+    def create_courses(size):
+        for course in factories.CourseFactory.create_batch(
+            size=size,
+            status=models.Course.Status.READY,
+        ):
+            course.students.add(*UserFactory.create_batch(size=2))
+            factories.TopicFactory.create_batch(size=2, course=course)
+            factories.ReviewFactory.create_batch(size=2, course=course)
+
+    def count_queries():
+        # Count of objects is cached
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(reverse_lazy("api:course-list"))
+        assert response.status_code == status.HTTP_200_OK
+        return len(context.captured_queries), len(response.data["results"])
+
+    create_courses(size=1)
+    queries_for_one, size = count_queries()
+    assert size == 1
+    create_courses(size=8)
+    queries_for_nine, size = count_queries()
+    assert size == 9
+    assert queries_for_one == queries_for_nine
+
+
+def test_list_courses_count_is_cached(
+    api_client,
+) -> None:
+    """Test count of courses is reused by next requests of the same list."""
+    factories.CourseFactory.create_batch(
+        size=3,
+        status=models.Course.Status.READY,
+    )
+    url = reverse_lazy("api:course-list")
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 3
+    assert not response.data["count_is_approximate"]
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url)
+    assert response.data["count"] == 3
+    assert not any(
+        "COUNT(" in query["sql"].upper() for query in context.captured_queries
+    )
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, {"pagination": "cursor"})
+    assert len(response.data["results"]) == 3
+    assert not any(
+        "COUNT(" in query["sql"].upper() for query in context.captured_queries
+    )
+
+
+def test_save_course_updates_changed_fields() -> None:
+    """Test update of loaded course writes only changed fields."""
+    course = models.Course.objects.get(pk=factories.CourseFactory.create().pk)
+    modified = course.modified
+    course.price = Decimal("10.00")
+    with CaptureQueriesContext(connection) as context:
+        course.save()
+    (query,) = [
+        query
+        for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "courses_course"')
+    ]
+    assert '"price"' in query["sql"] and '"modified"' in query["sql"]
+    assert '"name"' not in query["sql"]
+    course.refresh_from_db()
+    assert course.price == Decimal("10.00")
+    assert course.modified > modified
+    with CaptureQueriesContext(connection) as context:
+        course.save()
+    assert not context.captured_queries
+
+
+def test_refresh_course_takes_snapshot() -> None:
+    """Test refreshed course doesn't rewrite fields changed by others."""
+    pk = factories.CourseFactory.create(status=models.Course.Status.DRAFT).pk
+    course = models.Course.objects.get(pk=pk)
+    models.Course.objects.filter(pk=course.pk).update(
+        status=models.Course.Status.READY,
+    )
+    course.refresh_from_db()
+    assert course.get_changed_fields() == []
+    with CaptureQueriesContext(connection) as context:
+        course.save()
+    assert not context.captured_queries
+    assert not course.notifications.exists()
+
+
+def test_save_untracked_course_updates_all_fields() -> None:
+    """Test course loaded without tracking of changes saves all fields."""
+    pk = factories.CourseFactory.create().pk
+    with untracked_changes():
+        course = models.Course.objects.get(pk=pk)
+        assert course.get_changed_fields() is None
+        course.price = Decimal("10.00")
+        with CaptureQueriesContext(connection) as context:
+            course.save()
+    (query,) = [
+        query
+        for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "courses_course"')
+    ]
+    assert '"name"' in query["sql"]
+    assert not hasattr(course, "_snapshot")
+
+
+def test_search_courses(
+    api_client,
+) -> None:
+    """Test search of courses ranks matches in name above description."""
+    in_description = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+        name="Backend",
+        description="Django for beginners",
+    )
+    in_name = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+        name="Django",
+        description="Web framework",
+    )
+    factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+        name="Frontend",
+        description="Vue for beginners",
+    )
+    response = api_client.get(
+        reverse_lazy("api:course-list"),
+        data={"search": "django"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [course["id"] for course in response.data["results"]] == [
+        in_name.id,
+        in_description.id,
+    ]
+
+
+def test_list_courses_by_cursor(
+    api_client,
+) -> None:
+    """Test cursor pagination of courses goes forward and back."""
+    factories.CourseFactory.create_batch(
+        size=12,
+        status=models.Course.Status.READY,
+    )
+    response = api_client.get(
+        reverse_lazy("api:course-list"),
+        data={"pagination": "cursor"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert "count" not in response.data
+    assert response.data["links"]["previous"] is None
+    first_page = [course["id"] for course in response.data["results"]]
+    assert len(first_page) == 9
+    response = api_client.get(f"{response.data['links']['next']}&count=true")
+    assert response.data["count"] == 12
+    assert response.data["links"]["next"] is None
+    second_page = [course["id"] for course in response.data["results"]]
+    assert len(second_page) == 3
+    assert not set(first_page) & set(second_page)
+    response = api_client.get(response.data["links"]["previous"])
+    assert [course["id"] for course in response.data["results"]] == first_page
+
+
+def test_course_outline(
+    user,
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    """Test outline of course is fetched by one query per level of tree."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    for topic in factories.TopicFactory.create_batch(size=2, course=course):
+        for task in factories.TaskFactory.create_batch(size=2, topic=topic):
+            factories.AnswerFactory.create_batch(size=2, task=task)
+    api_client.force_authenticate(user=user)
+    # Savepoints, course of permissions, membership, snapshot, course,
+    # topics, tasks, answers
+    with django_assert_num_queries(9):
+        response = api_client.get(
+            reverse_lazy("api:course-outline", kwargs={"pk": course.pk}),
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["topics"]) == 2
+    assert [len(topic["tasks"]) for topic in response.data["topics"]] == [2, 2]
+    answers = response.data["topics"][0]["tasks"][0]["answers"]
+    assert len(answers) == 2
+    assert all("is_true" not in answer for answer in answers)
+
+
+def test_course_outline_by_not_student(
+    user,
+    api_client,
+) -> None:
+    """Test outline of course is available only for students and owner."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    api_client.force_authenticate(user=user)
+    response = api_client.get(
+        reverse_lazy("api:course-outline", kwargs={"pk": course.pk}),
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_retrieve_course_conditionally(
+    api_client,
+) -> None:
+    """Test course isn't rendered again until it or its topics change."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    url = reverse_lazy("api:course-detail", kwargs={"pk": course.pk})
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Last-Modified"]
+    etag = response["ETag"]
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    factories.TopicFactory.create(course=course)
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_retrieve_course_conditionally_without_prefetch(
+    api_client,
+) -> None:
+    """Test not modified course is answered without fetch of its relations."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    factories.TopicFactory.create(course=course)
+    url = reverse_lazy("api:course-detail", kwargs={"pk": course.pk})
+    etag = api_client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    (query,) = [
+        query["sql"] for query in context.captured_queries if "courses_" in query["sql"]
+    ]
+    assert '"courses_course"."modified"' in query
+    assert "courses_topic" not in query
+
+
+def test_list_courses_conditionally(
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    """Test list of courses isn't rendered again until courses change."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    url = reverse_lazy("api:course-list")
+    etag = api_client.get(url)["ETag"]
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    with django_capture_on_commit_callbacks(execute=True):
+        course.delete()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 1
+
+
+def test_list_courses_conditionally_after_update(
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    """Test list of courses is rendered again when course leaves it."""
+    category = factories.CategoryFactory.create(name="January")
+    other_category = factories.CategoryFactory.create(name="February")
+    course, _ = factories.CourseFactory.create_batch(
+        size=2,
+        status=models.Course.Status.READY,
+        category=category,
+    )
+    url = reverse_lazy("api:course-list")
+    etag = api_client.get(url, {"category": category.pk})["ETag"]
+    with django_capture_on_commit_callbacks(execute=True):
+        course.category = other_category
+        course.save()
+    response = api_client.get(
+        url,
+        {"category": category.pk},
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 1
+    etag = response["ETag"]
+    with django_capture_on_commit_callbacks(execute=True):
+        services.update_course_ratings(models.Course.objects.all())
+    response = api_client.get(
+        url,
+        {"category": category.pk},
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_list_courses_validators_without_queries(
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    """Test that ETag of list of courses is computed without queries."""
+    factories.CourseFactory.create(status=models.Course.Status.READY)
+    url = reverse_lazy("api:course-list")
+    etag = api_client.get(url)["ETag"]
+    # Savepoints of atomic request only
+    with django_assert_num_queries(2):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_course_changes(
+    user,
+    api_client,
+) -> None:
+    """Test changes of course since cursor contain only changed objects."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    other_task, task = factories.TaskFactory.create_batch(
+        size=2,
+        topic__course=course,
+    )
+    answer = factories.AnswerFactory.create(task=task)
+    # Objects are changed before overlap of pages
+    past = timezone.now() - 2 * services.changes.CHANGES_OVERLAP
+    for model in (models.Topic, models.Task, models.Answer):
+        model.objects.update(modified=past)
+    url = reverse_lazy("api:course-changes", kwargs={"pk": course.pk})
+    api_client.force_authenticate(user=user)
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["tasks"]) == 2
+    assert response.data["deleted"] == []
+    cursor = response.data["cursor"]
+    new_answer = factories.AnswerFactory.create(task=task)
+    deleted_pk = answer.pk
+    answer.delete()
+    response = api_client.get(url, data={"since": cursor})
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data["answers"]] == [new_answer.pk]
+    assert [item["id"] for item in response.data["tasks"]] == [task.pk]
+    assert response.data["topics"] == []
+    assert response.data["deleted"] == [{"kind": "answer", "object_id": deleted_pk}]
+    response = api_client.get(url, data={"since": response.data["cursor"]})
+    assert [item["id"] for item in response.data["answers"]] == [new_answer.pk]
+    assert response.data["deleted"] == [{"kind": "answer", "object_id": deleted_pk}]
+
+
+def test_course_changes_catch_late_committed_objects(
+    user,
+    api_client,
+) -> None:
+    """Test next page of changes contains object stamped before cursor."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    url = reverse_lazy("api:course-changes", kwargs={"pk": course.pk})
+    api_client.force_authenticate(user=user)
+    response = api_client.get(url)
+    cursor = response.data["cursor"]
+    topic = factories.TopicFactory.create(course=course)
+    # Topic is committed after read of page, but stamped before its end
+    models.Topic.objects.filter(pk=topic.pk).update(
+        modified=services.decode_cursor(cursor) + timedelta(seconds=1),
+    )
+    response = api_client.get(url, data={"since": cursor})
+    assert [item["id"] for item in response.data["topics"]] == [topic.pk]
+
+
+def test_delete_course_skips_signals_of_its_objects() -> None:
+    """Test deletion of course doesn't write tombstones of its objects."""
+    course = factories.CourseFactory.create()
+    topic = factories.TopicFactory.create(course=course)
+    task = factories.TaskFactory.create(topic=topic)
+    factories.AnswerFactory.create_batch(size=2, task=task)
+    factories.CommentFactory.create_batch(size=2, task=task)
+    other_topic = factories.TopicFactory.create()
+    deleted_pk = other_topic.pk
+    other_topic.delete()
+    course.delete()
+    assert list(models.Tombstone.objects.values_list("object_id", flat=True)) == [
+        deleted_pk,
+    ]
+    factories.TopicFactory.create_batch(size=2)
+    models.Course.objects.all().delete()
+    assert not models.Tombstone.objects.exists()
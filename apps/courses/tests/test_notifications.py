@@ -0,0 +1,144 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.services import email
+from apps.courses import factories, models, services, tasks
+from apps.users.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_notifications_are_coalesced(
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+) -> None:
+    """Test dispatch of notifications is scheduled once after commit."""
+    jobs = []
+    monkeypatch.setattr(
+        tasks.dispatch_course_notifications,
+        "apply_async",
+        lambda args, **kwargs: jobs.append(args),
+    )
+    course = factories.CourseFactory.create()
+    with django_capture_on_commit_callbacks(execute=True):
+        for user in UserFactory.create_batch(size=3):
+            course.students.add(user)
+        assert not jobs
+    assert jobs == [(course.pk, models.CourseNotification.Mode.ENTERED)]
+
+
+def test_dispatch_notifications(
+    monkeypatch,
+    mailoutbox,
+) -> None:
+    """Test each recipient gets one email, recipients are sent by chunks."""
+    chunks = []
+
+    def send_chunk(*args):
+        chunks.append(args[1])
+        tasks.send_email_about_course_to_users(*args)
+
+    monkeypatch.setattr(services.notifications, "NOTIFICATION_BATCH_SIZE", 2)
+    monkeypatch.setattr(tasks.send_email_about_course_to_users, "delay", send_chunk)
+    course = factories.CourseFactory.create()
+    users = UserFactory.create_batch(size=3)
+    mode = models.CourseNotification.Mode.ENTERED
+    services.notify(course.pk, mode, [user.pk for user in users])
+    services.notify(course.pk, mode, [users[0].pk])
+    assert services.dispatch_notifications(course.pk, mode) == 3
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert sorted(mail.to[0] for mail in mailoutbox) == sorted(
+        user.email for user in users
+    )
+    assert not course.notifications.filter(mode=mode, sent__isnull=True).exists()
+    assert services.dispatch_notifications(course.pk, mode) == 0
+
+
+def test_notifications_stay_pending_until_delivered(
+    monkeypatch,
+    mailoutbox,
+) -> None:
+    """Test chunks, which failed to be enqueued, are sent by next dispatch."""
+
+    def fail_chunk(*args):
+        raise OSError("Broker is unavailable")
+
+    monkeypatch.setattr(services.notifications, "NOTIFICATION_BATCH_SIZE", 2)
+    monkeypatch.setattr(tasks.send_email_about_course_to_users, "delay", fail_chunk)
+    course = factories.CourseFactory.create()
+    users = UserFactory.create_batch(size=3)
+    mode = models.CourseNotification.Mode.ENTERED
+    services.notify(course.pk, mode, [user.pk for user in users])
+    with pytest.raises(OSError):
+        services.dispatch_notifications(course.pk, mode)
+    assert course.notifications.filter(mode=mode, sent__isnull=True).count() == 3
+    monkeypatch.setattr(
+        tasks.send_email_about_course_to_users,
+        "delay",
+        tasks.send_email_about_course_to_users,
+    )
+    assert services.dispatch_notifications(course.pk, mode) == 3
+    assert len(mailoutbox) == 3
+    assert not course.notifications.filter(mode=mode, sent__isnull=True).exists()
+
+
+def test_students_milestone_is_notified_once(
+    monkeypatch,
+) -> None:
+    """Test milestone of count of students is notified once without COUNT."""
+    monkeypatch.setattr(services.membership, "STUDENTS_COUNT", (2, 3))
+    course = factories.CourseFactory.create()
+    first, *users = UserFactory.create_batch(size=4)
+    course.students.add(first)
+    with CaptureQueriesContext(connection) as context:
+        course.students.add(*users[:2])
+    assert not any(
+        "COUNT(" in query["sql"].upper() for query in context.captured_queries
+    )
+    course.students.remove(first)
+    course.students.add(users[2])
+    course.refresh_from_db()
+    assert (course.students_count, course.students_milestone) == (3, 3)
+    notifications = course.notifications.filter(
+        mode=models.CourseNotification.Mode.ATTENDANCE,
+    )
+    assert list(notifications.values_list("user_id", flat=True)) == [
+        course.owner_id,
+    ]
+
+
+def test_only_biggest_of_passed_milestones_is_notified(
+    monkeypatch,
+) -> None:
+    """Test that enroll passing several milestones notifies the biggest one."""
+    monkeypatch.setattr(services.membership, "STUDENTS_COUNT", (1, 2, 4))
+    course = factories.CourseFactory.create()
+    users = UserFactory.create_batch(size=4)
+    info = services.resolve_course({"course": course.pk})
+    services.enroll_students(info, [user.pk for user in users[:3]])
+    course.refresh_from_db()
+    assert course.students_milestone == 2
+    notifications = course.notifications.filter(
+        mode=models.CourseNotification.Mode.ATTENDANCE,
+    )
+    assert notifications.count() == 1
+    services.enroll_students(info, [users[3].pk])
+    course.refresh_from_db()
+    assert course.students_milestone == 4
+    assert notifications.count() == 2
+
+
+def test_email_fragment_of_course_is_cached(
+    django_assert_num_queries,
+) -> None:
+    """Test topics of course are rendered once until course is changed."""
+    course = factories.CourseFactory.create()
+    factories.TopicFactory.create(course=course, title="First topic")
+    course.refresh_from_db()
+    assert "First topic" in email.get_course_context(course)["topics"]
+    with django_assert_num_queries(0):
+        email.get_course_context(course)
+    factories.TopicFactory.create(course=course, title="Second topic")
+    course.refresh_from_db()
+    assert "Second topic" in email.get_course_context(course)["topics"]
@@ -0,0 +1,41 @@
+import pytest
+
+from apps.courses import factories, models
+from apps.courses.services import CourseInfo, resolve_course
+
+pytestmark = pytest.mark.django_db
+
+
+def test_resolve_course_of_each_kind(
+    django_assert_num_queries,
+) -> None:
+    """Test course of any object is resolved by one query."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    topic = factories.TopicFactory.create(
+        course=course,
+    )
+    task = factories.TaskFactory.create(
+        topic=topic,
+    )
+    objects = {
+        "course": course,
+        "topic": topic,
+        "task": task,
+        "answer": factories.AnswerFactory.create(task=task),
+        "comment": factories.CommentFactory.create(task=task),
+        "review": factories.ReviewFactory.create(course=course),
+        "answer-by-user": factories.AnswerByUserFactory.create(task=task),
+    }
+    expected = CourseInfo(course.id, course.owner_id, course.status)
+    for kind, instance in objects.items():
+        with django_assert_num_queries(1):
+            assert resolve_course({kind: instance.pk}) == expected
+
+
+def test_resolve_course_of_unknown_object() -> None:
+    """Test resolving of missing object or unknown data."""
+    assert resolve_course({"task": 0}) is None
+    assert resolve_course({"task": "not-a-pk"}) is None
+    assert resolve_course({"content": "text"}) is None
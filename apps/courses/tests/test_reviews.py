@@ -1,8 +1,9 @@
 import pytest
+from django.core.management import call_command
 from django.urls import reverse_lazy
 from rest_framework import status
 
-from apps.courses import factories, models
+from apps.courses import factories, models, services
 
 pytestmark = pytest.mark.django_db
 
@@ -236,3 +237,90 @@ def test_owner_course_read_review(
         reverse_lazy("api:review-detail", kwargs={"pk": review.pk}),
     )
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_rating_of_course_follows_reviews() -> None:
+    """Test stored rating of course after create, update and remove review."""
+    course = factories.CourseFactory.create()
+    review = factories.ReviewFactory.create(
+        course=course,
+        rating=5,
+    )
+    factories.ReviewFactory.create(
+        course=course,
+        rating=2,
+    )
+    course.refresh_from_db()
+    assert (course.rating_sum, course.rating_count) == (7, 2)
+    assert course.rating == 3.5
+    review.rating = 4
+    review.save()
+    course.refresh_from_db()
+    assert course.rating == 3
+    review.delete()
+    course.refresh_from_db()
+    assert (course.rating_sum, course.rating_count) == (2, 1)
+
+
+def test_rating_of_course_is_updated_under_lock(
+    monkeypatch,
+) -> None:
+    """Test that courses are locked before their rating is recalculated."""
+    locked = []
+
+    def lock_rows(queryset):
+        pks = services.locking.lock_rows(queryset)
+        locked.append(pks)
+        return pks
+
+    monkeypatch.setattr(services.ratings, "lock_rows", lock_rows)
+    review = factories.ReviewFactory.create(rating=5)
+    assert locked == [[review.course_id]]
+    review.course.refresh_from_db()
+    assert (review.course.rating_sum, review.course.rating_count) == (5, 1)
+
+
+def test_rating_of_course_after_move_of_review() -> None:
+    """Test ratings of both courses after review moved to other course."""
+    review = factories.ReviewFactory.create(rating=5)
+    course = review.course
+    other_course = factories.CourseFactory.create()
+    review = models.Review.objects.get(pk=review.pk)
+    review.course = other_course
+    review.save()
+    course.refresh_from_db()
+    other_course.refresh_from_db()
+    assert (course.rating_sum, course.rating_count) == (0, 0)
+    assert (other_course.rating_sum, other_course.rating_count) == (5, 1)
+
+
+def test_rating_of_course_in_response(
+    api_client,
+) -> None:
+    """Test rating of course in response is read from stored aggregate."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    factories.ReviewFactory.create_batch(
+        size=3,
+        course=course,
+        rating=4,
+    )
+    response = api_client.get(
+        reverse_lazy("api:course-detail", kwargs={"pk": course.pk}),
+    )
+    assert response.data["rating"] == 4
+
+
+def test_rebuild_course_ratings() -> None:
+    """Test command for rebuild stored ratings of courses."""
+    course = factories.CourseFactory.create()
+    factories.ReviewFactory.create_batch(
+        size=2,
+        course=course,
+        rating=3,
+    )
+    models.Course.objects.update(rating_sum=0, rating_count=0)
+    call_command("rebuild_course_ratings")
+    course.refresh_from_db()
+    assert (course.rating_sum, course.rating_count) == (6, 2)
@@ -0,0 +1,86 @@
+import pytest
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from apps.courses import factories, models, services, tasks
+
+pytestmark = pytest.mark.django_db
+
+
+def test_outline_from_snapshot(
+    user,
+    api_client,
+) -> None:
+    """Test outline of published course is served from snapshot by ETag."""
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    factories.TaskFactory.create(topic__course=course)
+    snapshot = services.rebuild_snapshot(course.pk)
+    url = reverse_lazy("api:course-outline", kwargs={"pk": course.pk})
+    api_client.force_authenticate(user=user)
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == snapshot.data
+    etag = response["ETag"]
+    assert etag == f'"course-{course.pk}-{snapshot.version}"'
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_snapshot_is_invalidated_by_content(
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+) -> None:
+    """Test change of course content clears snapshot and schedules rebuild."""
+    jobs = []
+    monkeypatch.setattr(
+        tasks.rebuild_course_snapshot,
+        "apply_async",
+        lambda args, **kwargs: jobs.append(args),
+    )
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    topic = factories.TopicFactory.create(course=course)
+    snapshot = services.rebuild_snapshot(course.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        task = factories.TaskFactory.create(topic=topic)
+        factories.AnswerFactory.create_batch(size=2, task=task)
+    assert jobs == [(course.pk,)]
+    assert services.get_course_snapshot(course.pk) is None
+    snapshot = services.rebuild_snapshot(course.pk)
+    assert snapshot.version > 1
+    (topic_data,) = snapshot.data["topics"]
+    assert len(topic_data["tasks"][0]["answers"]) == 2
+
+
+def test_outline_schedules_missing_snapshot(
+    user,
+    api_client,
+    monkeypatch,
+) -> None:
+    """Test outline of published course without snapshot schedules it."""
+    jobs = []
+    monkeypatch.setattr(
+        tasks.rebuild_course_snapshot,
+        "apply_async",
+        lambda args, **kwargs: jobs.append(args),
+    )
+    course = factories.CourseFactory.create(
+        status=models.Course.Status.READY,
+    )
+    course.students.add(user)
+    draft = factories.CourseFactory.create(
+        status=models.Course.Status.DRAFT,
+        owner=user,
+    )
+    models.CourseSnapshot.objects.all().delete()
+    api_client.force_authenticate(user=user)
+    for pk in (course.pk, draft.pk):
+        response = api_client.get(
+            reverse_lazy("api:course-outline", kwargs={"pk": pk}),
+        )
+        assert response.status_code == status.HTTP_200_OK
+    assert jobs == [(course.pk,)]
@@ -3,6 +3,7 @@ from django.urls import reverse_lazy
 from rest_framework import status
 
 from apps.courses import factories, models
+from apps.courses.serializers.courses import EXPAND_LIMIT
 
 pytestmark = pytest.mark.django_db
 
@@ -231,3 +232,111 @@ def test_owner_read_task(
         reverse_lazy("api:task-detail", kwargs={"pk": task.pk}),
     )
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_retrieve_task_conditionally(
+    user,
+    api_client,
+) -> None:
+    """Test ETag of task changes when its answers change."""
+    task = factories.TaskFactory.create(
+        topic__course__owner=user,
+        topic__course__status=models.Course.Status.READY,
+    )
+    url = reverse_lazy("api:task-detail", kwargs={"pk": task.pk})
+    api_client.force_authenticate(user=user)
+    etag = api_client.get(url)["ETag"]
+    factories.AnswerFactory.create(task=task)
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert "answers" not in response.data
+    etag = response["ETag"]
+    response = api_client.get(url, {"expand": "answers"}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["answers"]) == 1
+
+
+def test_task_expand_is_capped(
+    user,
+    api_client,
+) -> None:
+    """Test that expanded comments of task are capped."""
+    task = factories.TaskFactory.create(
+        topic__course__owner=user,
+        topic__course__status=models.Course.Status.READY,
+    )
+    models.Comment.objects.bulk_create(
+        models.Comment(task=task, user=user, content="comment")
+        for _ in range(EXPAND_LIMIT + 1)
+    )
+    api_client.force_authenticate(user=user)
+    response = api_client.get(
+        reverse_lazy("api:task-detail", kwargs={"pk": task.pk}),
+        {"expand": "comments"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["comments"]) == EXPAND_LIMIT
+    assert response.data["comments"][0] == task.comments.earliest("pk").pk
+    assert "answers" not in response.data
+
+
+def test_list_task_comments(
+    user,
+    api_client,
+    monkeypatch,
+) -> None:
+    """Test comments of task by pages of cursor pagination with count."""
+    monkeypatch.setattr(
+        "apps.courses.views.TaskCommentsPagination.page_size",
+        2,
+    )
+    task = factories.TaskFactory.create(
+        topic__course__status=models.Course.Status.READY,
+    )
+    task.topic.course.students.add(user)
+    comments = factories.CommentFactory.create_batch(3, task=task)
+    factories.CommentFactory.create()
+    url = reverse_lazy("api:task-comments", kwargs={"pk": task.pk})
+    api_client.force_authenticate(user=user)
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 3
+    assert [item["id"] for item in response.data["results"]] == [
+        comments[2].pk,
+        comments[1].pk,
+    ]
+    response = api_client.get(response.data["links"]["next"])
+    assert [item["id"] for item in response.data["results"]] == [comments[0].pk]
+    assert response.data["links"]["next"] is None
+
+
+def test_list_task_comments_by_not_student(
+    user,
+    api_client,
+) -> None:
+    """Test that comments of task aren't listed for not student."""
+    task = factories.TaskFactory.create(
+        topic__course__status=models.Course.Status.READY,
+    )
+    api_client.force_authenticate(user=user)
+    response = api_client.get(
+        reverse_lazy("api:task-comments", kwargs={"pk": task.pk}),
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_delete_task_skips_signals_of_its_objects(
+    django_assert_max_num_queries,
+) -> None:
+    """Test deletion of task doesn't cost queries for each of its objects."""
+    task = factories.TaskFactory.create()
+    root = factories.CommentFactory.create(task=task)
+    factories.CommentFactory.create_batch(size=20, task=task, parent=root)
+    factories.CommentFactory.create_batch(size=20, task=task)
+    factories.AnswerFactory.create_batch(size=40, task=task)
+    task_pk = task.pk
+    with django_assert_max_num_queries(12):
+        task.delete()
+    assert list(models.Tombstone.objects.values_list("kind", "object_id")) == [
+        ("task", task_pk),
+    ]
@@ -9,6 +9,16 @@ urlpatterns = [
         views.AddStudentsToCourseView.as_view(),
         name="add-students",
     ),
+    path(
+        "courses/<int:pk>/bulk-students/",
+        views.BulkStudentsView.as_view(),
+        name="bulk-students",
+    ),
+    path(
+        "courses/<int:pk>/submit-answers/",
+        views.BatchAnswersView.as_view(),
+        name="submit-answers",
+    ),
     path(
         "courses/<int:pk>/add-interest/",
         views.AddCourseToInterestView.as_view(),
@@ -1,25 +1,142 @@
-from django.db.models import Q
+from django.db.models import Prefetch
+from django.http import Http404
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import generics
 from rest_framework import permissions as permis
 from rest_framework import response, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
 from apps.core import views
+from apps.core.models import untracked_changes
+from apps.core.services import CursorPaginationObject
 from apps.users.models import User
 
-from . import models, permissions, serializers
+from . import models, permissions, serializers, services
 
 
-class CourseViewSet(views.BaseViewSet):
+class PermissionContextMixin:
+    """Mixin for reuse object, which was fetched by permissions."""
+
+    def get_target_queryset(self):
+        """Get queryset for search object from url."""
+        return self.get_queryset()
+
+    def get_modified_queryset(self):
+        """Overriden for look up object like `PermissionContext` does."""
+        return self.get_target_queryset()
+
+    def get_object(self):
+        """Overriden for get object from `PermissionContext` of request."""
+        instance = permissions.get_permission_context(self.request, self).target
+        if instance is None:
+            raise Http404
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+
+class CourseViewSet(PermissionContextMixin, views.BaseViewSet):
     """ViewSet for Course model."""
 
     serializer_class = serializers.CourseSerializer
     queryset = models.Course.objects.filter(status=models.Course.Status.READY)
     permission_classes = (permissions.IsStudent | permissions.IsOwner,)
+    # Query plan for read actions: serializer renders relations as lists of
+    # pks, `owner` and `category` are rendered from their ``_id`` columns and
+    # rating is stored in course, so only pks of relations are prefetched.
+    # Search vector isn't rendered at all.
+    read_actions = ("list", "retrieve")
+    prefetch_plan = (
+        Prefetch("students", queryset=User.objects.only("id")),
+        Prefetch("topics", queryset=models.Topic.objects.only("id", "course")),
+        Prefetch("reviews", queryset=models.Review.objects.only("id", "course")),
+    )
+
+    # Serializers of kinds of changes of course
+    change_serializers = {
+        "topics": serializers.TopicSerializer,
+        "tasks": serializers.TaskSerializer,
+        "answers": serializers.AnswerSerializer,
+        "comments": serializers.CommentSerializer,
+        "reviews": serializers.ReviewSerializer,
+    }
+
+    def plan_queryset(self, object_list):
+        """Prefetch relations rendered by serializer for read actions."""
+        if self.action in self.read_actions:
+            return object_list.defer("search_vector").prefetch_related(
+                *self.prefetch_plan,
+            )
+        if self.action == "outline":
+            return services.prefetch_outline(object_list)
+        return object_list
 
-    def get_object(self) -> models.Course:
+    def get_serializer_class(self):
+        """Overriden for use nested serializer for outline."""
+        if self.action == "outline":
+            return serializers.CourseOutlineSerializer
+        return super().get_serializer_class()
+
+    @action(detail=True, methods=["get"])
+    def outline(self, request, *args, **kwargs):
+        """Get course with its topics, tasks and answers by one request.
+
+        Outline of published course is served from its snapshot with version
+        of snapshot as ETag. If snapshot isn't built, e.g. course was
+        published before snapshots, its rebuild is scheduled.
+
+        """
+        snapshot = services.get_course_snapshot(self.kwargs["pk"])
+        if snapshot is None:
+            course = self.get_object()
+            if course.status == models.Course.Status.READY:
+                services.schedule_rebuild(course.pk)
+            serializer = self.get_serializer(course)
+            return response.Response(serializer.data)
+        etag = quote_etag(f"course-{snapshot.course_id}-{snapshot.version}")
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return response.Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag},
+            )
+        return response.Response(snapshot.data, headers={"ETag": etag})
+
+    @action(detail=True, methods=["get"])
+    def changes(self, request, *args, **kwargs):
+        """Get objects of course changed since cursor and deleted objects.
+
+        ``since`` query param is cursor from previous response, without it
+        all objects of course are returned. Pages overlap, so objects
+        may be repeated in next page.
+
+        """
+        until = timezone.now()
+        since = request.query_params.get("since")
+        try:
+            since = services.decode_cursor(since) if since else None
+        except (ValueError, OverflowError):
+            raise ValidationError({"since": "Invalid cursor"})
+        changes = services.get_course_changes(self.kwargs["pk"], since, until)
+        context = self.get_serializer_context()
+        data = {"cursor": services.get_next_cursor(until)}
+        # Changed objects are only serialized
+        with untracked_changes():
+            for kind, serializer_class in self.change_serializers.items():
+                data[kind] = serializer_class(
+                    changes[kind],
+                    many=True,
+                    context=context,
+                ).data
+        data["deleted"] = list(changes["deleted"].values("kind", "object_id"))
+        return response.Response(data)
+
+    def get_target_queryset(self):
         """Overriden for get object, because some object hasn't status `READY`."""
-        return models.Course.objects.get(pk=self.kwargs["pk"])
+        return self.plan_queryset(models.Course.objects.all())
 
     def perform_create(self, serializer) -> None:
         """Overriden for create instanse and get User instanse from request."""
@@ -29,10 +146,7 @@ class CourseViewSet(views.BaseViewSet):
         """Filter queryset by search query."""
         query_search = self.request.GET.get("search")
         if query_search:
-            return object_list.filter(
-                Q(name__icontains=query_search)
-                | Q(description__icontains=query_search),
-            )
+            return services.get_search_backend().search(object_list, query_search)
         return object_list
 
     def category_queryset(self, object_list):
@@ -49,7 +163,7 @@ class CourseViewSet(views.BaseViewSet):
         object_list = self.queryset
         object_list = self.search_queryset(object_list)
         object_list = self.category_queryset(object_list)
-        return object_list
+        return self.plan_queryset(object_list)
 
 
 class AddStudentsToCourseView(APIView):
@@ -57,39 +171,103 @@ class AddStudentsToCourseView(APIView):
 
     def post(self, request, *args, **kwargs):
         """Handler POST request."""
-        course = models.Course.objects.get(pk=self.kwargs["pk"])
-        user = User.objects.get(pk=request.user.pk)
-        message = ""
-        if user in course.students.all():
-            course.students.remove(user)
-            message = "remove"
-            if user in course.want_pass_users.all():
-                course.want_pass_users.remove(user)
-            if user in course.archive_users.all():
-                course.archive_users.remove(user)
-        else:
-            course.students.add(user)
-            message = "add"
+        added = services.toggle_member(self.kwargs["pk"], "students", request.user.pk)
+        if added is None:
+            raise Http404
+        message = "add" if added else "remove"
         return response.Response(
             data={"message": f"Success {message} students to course"},
             status=status.HTTP_200_OK,
         )
 
 
+class BulkStudentsView(APIView):
+    """View for add or remove many students of course by its owner."""
+
+    def post(self, request, *args, **kwargs):
+        """Handler POST request."""
+        course = services.resolve_course({"course": self.kwargs["pk"]})
+        if course is None:
+            raise Http404
+        if not permissions.is_owner(request.user, course):
+            raise PermissionDenied
+        serializer = serializers.BulkStudentsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        bulk_action = serializer.validated_data["action"]
+        user_ids, not_found = services.find_users(
+            serializer.validated_data["users"],
+        )
+        if bulk_action == "add":
+            count = len(services.enroll_students(course, user_ids))
+        else:
+            count = services.remove_members(course.course_id, "students", user_ids)
+        return response.Response(
+            data={
+                "action": bulk_action,
+                "count": count,
+                "not_found": not_found,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class BatchAnswersView(APIView):
+    """View for submit answers of user to many tests of course at once."""
+
+    def post(self, request, *args, **kwargs):
+        """Handler POST request.
+
+        Membership in course is checked once for all answers, chosen
+        answers are graded in one pass and answers are saved by one upsert.
+
+        """
+        course = services.resolve_course({"course": self.kwargs["pk"]})
+        if course is None:
+            raise Http404
+        if not (
+            permissions.is_student(request.user, course)
+            or permissions.is_owner(request.user, course)
+        ):
+            raise PermissionDenied
+        serializer = serializers.BatchAnswersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        choices = {
+            item["task"]: item["choices"]
+            for item in serializer.validated_data["answers"]
+        }
+        found = services.find_test_tasks(course.course_id, choices)
+        not_found = [pk for pk in choices if pk not in found]
+        if not_found:
+            raise ValidationError(
+                {"answers": f"Tests {not_found} aren't found in course"},
+            )
+        saved = services.submit_answers(request.user.id, choices)
+        return response.Response(
+            data={
+                "answers": serializers.AnswerByUserSerializer(
+                    saved,
+                    many=True,
+                ).data,
+                "score": sum(answer.answer is True for answer in saved),
+                "total": len(saved),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class AddCourseToInterestView(APIView):
     """View for course to interest by some user."""
 
     def post(self, request, *args, **kwargs):
         """Handler POST request."""
-        course = models.Course.objects.get(pk=self.kwargs["pk"])
-        user = User.objects.get(pk=self.request.user.pk)
-        message = ""
-        if user in course.interest_users.all():
-            course.interest_users.remove(user)
-            message = "remove"
-        else:
-            course.interest_users.add(user)
-            message = "add"
+        added = services.toggle_member(
+            self.kwargs["pk"],
+            "interest_users",
+            request.user.pk,
+        )
+        if added is None:
+            raise Http404
+        message = "add" if added else "remove"
         return response.Response(
             data={"message": f"Success {message} course to interest"},
             status=status.HTTP_200_OK,
@@ -101,25 +279,22 @@ class AddCourseToWantedPassingView(APIView):
 
     def post(self, request, *args, **kwargs):
         """Handler POST request."""
-        course = models.Course.objects.get(pk=self.kwargs["pk"])
-        user = User.objects.get(pk=self.request.user.pk)
-        if user in course.students.all():
-            message = ""
-            if user in course.want_pass_users.all():
-                course.want_pass_users.remove(user)
-                message = "remove"
-            else:
-                course.want_pass_users.add(user)
-                message = "add"
+        added = services.toggle_member(
+            self.kwargs["pk"],
+            "want_pass_users",
+            request.user.pk,
+        )
+        if added is None:
             return response.Response(
-                data={"message": f"Success {message} course to wanted-passing"},
-                status=status.HTTP_200_OK,
+                data={
+                    "message": "User is not in students of course",
+                },
+                status=status.HTTP_404_NOT_FOUND,
             )
+        message = "add" if added else "remove"
         return response.Response(
-            data={
-                "message": "User is not in students of course",
-            },
-            status=status.HTTP_404_NOT_FOUND,
+            data={"message": f"Success {message} course to wanted-passing"},
+            status=status.HTTP_200_OK,
         )
 
 
@@ -128,29 +303,26 @@ class AddCourseToAchiveView(APIView):
 
     def post(self, request, *args, **kwargs):
         """Handler POST request."""
-        course = models.Course.objects.get(pk=self.kwargs["pk"])
-        user = User.objects.get(pk=self.request.user.pk)
-        if user in course.students.all():
-            message = ""
-            if user in course.archive_users.all():
-                course.archive_users.remove(user)
-                message = "remove"
-            else:
-                course.archive_users.add(user)
-                message = "add"
+        added = services.toggle_member(
+            self.kwargs["pk"],
+            "archive_users",
+            request.user.pk,
+        )
+        if added is None:
             return response.Response(
-                data={"message": f"Success {message} course to achive"},
-                status=status.HTTP_200_OK,
+                data={
+                    "message": "User is not in students of course",
+                },
+                status=status.HTTP_404_NOT_FOUND,
             )
+        message = "add" if added else "remove"
         return response.Response(
-            data={
-                "message": "User is not in students of course",
-            },
-            status=status.HTTP_404_NOT_FOUND,
+            data={"message": f"Success {message} course to achive"},
+            status=status.HTTP_200_OK,
         )
 
 
-class TopicViewSet(views.SimpleBaseViewSet):
+class TopicViewSet(PermissionContextMixin, views.SimpleBaseViewSet):
     """ViewSet for Topic model."""
 
     serializer_class = serializers.TopicSerializer
@@ -158,15 +330,81 @@ class TopicViewSet(views.SimpleBaseViewSet):
     permission_classes = (permissions.IsStudent | permissions.IsOwner,)
 
 
-class TaskViewSet(views.SimpleBaseViewSet):
+class TaskCommentsPagination(CursorPaginationObject):
+    """Cursor pagination of comments of task with cached count."""
+
+    count_by_default = True
+
+
+class TaskViewSet(PermissionContextMixin, views.SimpleBaseViewSet):
     """ViewSet for Task model."""
 
     serializer_class = serializers.TaskSerializer
     queryset = models.Task.objects.all()
     permission_classes = (permissions.IsStudent | permissions.IsOwner,)
+    discussion_page_size = api_settings.PAGE_SIZE
+    comments_pagination_class = TaskCommentsPagination
+
+    def get_int_param(self, name: str) -> int | None:
+        """Get not negative integer query param."""
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        if not value.isdecimal():
+            raise ValidationError({name: "Must be not negative integer"})
+        return int(value)
+
+    @action(detail=True, methods=["get"])
+    def comments(self, request, *args, **kwargs):
+        """Get comments of task by pages of cursor pagination."""
+        paginator = self.comments_pagination_class()
+        page = paginator.paginate_queryset(
+            models.Comment.objects.filter(task_id=self.kwargs["pk"]),
+            request,
+            view=self,
+        )
+        serializer = serializers.DiscussionCommentSerializer(
+            page,
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        return paginator.get_paginated_response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def discussion(self, request, *args, **kwargs):
+        """Get threads of comments of task by pages of root comments.
 
-class AnswerViewSet(views.SimpleBaseViewSet):
+        ``cursor`` query param is pk of last root of previous page,
+        ``depth`` limits depth of replies.
+
+        """
+        comments, next_root = services.get_discussion(
+            self.kwargs["pk"],
+            after=self.get_int_param("cursor"),
+            size=self.discussion_page_size,
+            depth=self.get_int_param("depth"),
+        )
+        data = serializers.DiscussionCommentSerializer(
+            comments,
+            many=True,
+            context=self.get_serializer_context(),
+        ).data
+        next_link = None
+        if next_root is not None:
+            next_link = replace_query_param(
+                request.build_absolute_uri(),
+                "cursor",
+                next_root,
+            )
+        return response.Response(
+            {
+                "links": {"next": next_link},
+                "results": services.build_threads(comments, data),
+            },
+        )
+
+
+class AnswerViewSet(PermissionContextMixin, views.SimpleBaseViewSet):
     """ViewSet for Answer model."""
 
     serializer_class = serializers.AnswerSerializer
@@ -174,7 +412,7 @@ class AnswerViewSet(views.SimpleBaseViewSet):
     permission_classes = (permissions.IsStudent | permissions.IsOwner,)
 
 
-class CommentViewSet(views.SimpleBaseViewSet):
+class CommentViewSet(PermissionContextMixin, views.SimpleBaseViewSet):
     """ViewSet for Comment model."""
 
     serializer_class = serializers.CommentSerializer
@@ -186,7 +424,7 @@ class CommentViewSet(views.SimpleBaseViewSet):
         serializer.save(user=self.request.user)
 
 
-class ReviewViewSet(views.SimpleBaseViewSet):
+class ReviewViewSet(PermissionContextMixin, views.SimpleBaseViewSet):
     """ViewSet for Review model."""
 
     serializer_class = serializers.ReviewSerializer
@@ -198,29 +436,64 @@ class ReviewViewSet(views.SimpleBaseViewSet):
         serializer.save(user=self.request.user)
 
 
-class AnswerByUserViewSet(views.CRUBaseViewSet):
+class AnswerByUserViewSet(PermissionContextMixin, views.CRUBaseViewSet):
     """ViewSet for AnswerByUser model."""
 
     serializer_class = serializers.AnswerByUserSerializer
     queryset = models.AnswerByUser.objects.all()
     permission_classes = (permissions.IsStudent | permissions.IsOwner,)
 
+    def submit(self, serializer, task_id):
+        """Save answer of user or graded chosen answers of test.
+
+        Existing answer is kept if neither of them is passed.
+
+        """
+        data = serializer.validated_data
+        user_id = self.request.user.id
+        if "choices" in data:
+            return services.submit_answers(user_id, {task_id: data["choices"]})[0]
+        if "answer" in data:
+            return services.upsert_answers(user_id, {task_id: data["answer"]})[0]
+        return services.upsert_answers(user_id, {task_id: None}, update=False)[0]
+
     def perform_create(self, serializer) -> None:
-        """Overriden for create instanse and get User instanse from request."""
-        serializer.save(user=self.request.user)
+        """Overriden for save answer of user by one upsert."""
+        serializer.instance = self.submit(
+            serializer,
+            serializer.validated_data["task"].pk,
+        )
 
-    def get_object(self):
-        """Overriden for get need instanse."""
-        answers = models.AnswerByUser.objects.filter(
-            user=self.request.user,
-            task=models.Task.objects.get(id=self.kwargs["pk"]),
+    def update(self, request, *args, **kwargs):
+        """Overriden for save answer of task from url by one upsert.
+
+        Answer isn't fetched before update and task from data is ignored,
+        only type of task from url is fetched for validation.
+
+        """
+        task = generics.get_object_or_404(
+            models.Task.objects.only("id", "type_task"),
+            pk=self.kwargs["pk"],
         )
-        if answers:
-            return answers.first()
-        return models.AnswerByUser.objects.create(
-            user=self.request.user,
-            task=models.Task.objects.get(id=self.kwargs["pk"]),
+        serializer = self.get_serializer(
+            data=request.data,
+            partial=kwargs.get("partial", False),
+            context={**self.get_serializer_context(), "task": task},
         )
+        serializer.is_valid(raise_exception=True)
+        serializer.instance = self.submit(serializer, int(self.kwargs["pk"]))
+        return response.Response(serializer.data)
+
+    def get_object(self):
+        """Overriden for get need instanse or create it."""
+        answer = permissions.get_permission_context(self.request, self).target
+        if answer is None:
+            answer = services.upsert_answers(
+                self.request.user.id,
+                {int(self.kwargs["pk"]): None},
+                update=False,
+            )[0]
+        return answer
 
 
 class CategoryListAPIView(generics.ListAPIView):
@@ -362,3 +362,6 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Default pagination of viewsets: ``page`` (by number of page) or ``cursor``
+# (by keyset on created and id), it can be switched by ``?pagination=``.
+PAGINATION_MODE = env("DJANGO_PAGINATION_MODE", default="page")
@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 from rest_framework import test
 
 from apps.users.factories import UserFactory
@@ -29,3 +30,10 @@ def auth_client(user, client):
 def api_client() -> test.APIClient:
     """Create api client."""
     return test.APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Clear cache, because cached data is bound to database of test."""
+    yield
+    cache.clear()
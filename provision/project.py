@@ -27,6 +27,12 @@ def fill_sample_data(context):
     django.manage(context, "runscript fill_sample_data")
 
 
+@task
+def benchmark_clean(context):
+    """Benchmark validation of bulk import of tasks and answers."""
+    django.manage(context, "runscript benchmark_clean")
+
+
 @task
 def init(context):
     """Prepare env for working with project."""
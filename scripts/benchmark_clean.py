@@ -0,0 +1,55 @@
+from timeit import timeit
+
+from django.core.exceptions import ValidationError
+
+from apps.courses import factories
+
+OBJECTS_COUNT = 10000
+REPEAT_COUNT = 5
+
+
+def clean_by_lookups(instance):
+    """Validate object by lookups of ``clean_<field>`` for each field."""
+    errors = {}
+    for field in instance._meta.fields:
+        clean_method = f"clean_{field.name}"
+        if hasattr(instance, clean_method):
+            try:
+                getattr(instance, clean_method)()
+            except ValidationError as error:
+                errors[field.name] = error
+    if errors:
+        raise ValidationError(errors)
+
+
+def benchmark(name, objects):
+    """Print cost of validation of objects by dispatch table and lookups."""
+    for title, clean in (
+        ("dispatch table", lambda instance: instance.clean()),
+        ("lookups", clean_by_lookups),
+    ):
+        seconds = timeit(
+            lambda: [clean(instance) for instance in objects],
+            number=REPEAT_COUNT,
+        )
+        microseconds = seconds / REPEAT_COUNT / len(objects) * 10**6
+        print(f"{name} by {title}: {microseconds:.2f} us per object")
+
+
+def run():
+    """Benchmark validation of bulk import of Tasks and Answers.
+
+    Objects aren't saved, so script can be run against any database by
+    ``python manage.py runscript benchmark_clean``.
+
+    """
+    tasks = factories.TaskFactory.build_batch(
+        size=OBJECTS_COUNT,
+        topic=None,
+    )
+    answers = factories.AnswerFactory.build_batch(
+        size=OBJECTS_COUNT,
+        task=None,
+    )
+    benchmark("Task", tasks)
+    benchmark("Answer", answers)